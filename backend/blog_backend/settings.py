@@ -21,16 +21,18 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
-    'django_ratelimit',
     'users',
     'posts',
 ]
 
 MIDDLEWARE = [
+    # En premier : la durée mesurée couvre tous les autres middlewares
+    'utils.middleware.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -76,11 +78,30 @@ DATABASES = {
 # Configuration REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication avec l'utilisateur lu depuis le cache (users.utils.get_cached_user)
+        'users.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
+    # orjson si installé, sinon json de la bibliothèque standard (utils/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': [
+        'utils.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    # Actif seulement sur les vues qui déclarent rate_limit_scope (voir RATE_LIMITS)
+    'DEFAULT_THROTTLE_CLASSES': [
+        'utils.ratelimit.RateLimitThrottle',
+    ],
+}
+
+# Limites de débit par scope (utils/ratelimit.py), par utilisateur et/ou par IP
+RATE_LIMITS = {
+    'register': {'ip': '5/m'},
+    'login': {'ip': '5/m'},
+    'password_reset': {'ip': '100/h'},
+    'comments': {'user': '10/m', 'ip': '30/m'},
+    'reactions': {'user': '60/m', 'ip': '120/m'},
 }
 
 # Configuration SimpleJWT
@@ -92,6 +113,31 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Hachage des mots de passe : 'pbkdf2' (défaut Django), 'argon2' (Argon2id, nécessite
+# argon2-cffi) ou 'scrypt'. Les autres hashers restent listés pour vérifier les anciens
+# mots de passe, re-hachés avec le hasher préféré à la connexion suivante.
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='pbkdf2')
+_PASSWORD_HASHER_CLASSES = {
+    'pbkdf2': 'users.hashers.TunedPBKDF2PasswordHasher',
+    'argon2': 'users.hashers.TunedArgon2PasswordHasher',
+    'scrypt': 'users.hashers.TunedScryptPasswordHasher',
+}
+# Hashers par défaut de Django sans équivalent ci-dessus : vérification seulement (ils ne sont
+# jamais préférés), pour ne pas bloquer les comptes hachés avant le choix de PASSWORD_HASHER
+_LEGACY_PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+PASSWORD_HASHERS = [_PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+] + _LEGACY_PASSWORD_HASHERS
+# Nombre maximal de hachages simultanés sur le chemin async (users/hashers.py)
+PASSWORD_HASH_WORKERS = 4
+
+# Rotation des refresh tokens (voir users/tokens.py) : 'blacklist' (tables simplejwt)
+# ou 'family' (détection de réutilisation par famille de tokens, état dans Redis)
+REFRESH_TOKEN_ROTATION = config('REFRESH_TOKEN_ROTATION', default='blacklist')
+
 # Configuration email
 EMAIL_BACKEND = 'utils.custom_email_backend.CustomEmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
@@ -100,6 +146,10 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = config('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 EMAIL_SSL_CONTEXT = ssl._create_unverified_context()
+# Pool de connexions SMTP de CustomEmailBackend
+EMAIL_POOL_SIZE = 4
+EMAIL_POOL_IDLE_TIMEOUT = 60
+EMAIL_POOL_MAX_MESSAGES = 100
 
 # Configuration CORS
 CORS_ALLOWED_ORIGINS = [
@@ -142,19 +192,57 @@ SECURE_HSTS_INCLUDE_SUBDOMAINS = False
 SECURE_HSTS_PRELOAD = False  
 
 # Logging
+# Journalisation non bloquante (utils/log.py) : lignes JSON écrites par lots dans un
+# thread dédié, rotation par taille ; les logs des chemins chauds sont limités ou échantillonnés.
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'utils.log.JsonFormatter',
+        },
+    },
+    'filters': {
+        # Au plus 20 lignes INFO par seconde et par site d'appel
+        'hot_path': {
+            '()': 'utils.log.RateLimitFilter',
+            'per_second': 20,
+        },
+        # Une requête sur 10 dans perf.log (les histogrammes de /api/metrics/ voient tout)
+        'perf_sample': {
+            '()': 'utils.log.SamplingFilter',
+            'rate': 0.1,
+        },
+    },
     'handlers': {
         'file': {
             'level': 'WARNING',
-            'class': 'logging.FileHandler',
+            'class': 'utils.log.QueuedFileHandler',
             'filename': os.path.join(BASE_DIR, 'logs/auth.log'),
+            'max_bytes': LOG_MAX_BYTES,
+            'backup_count': LOG_BACKUP_COUNT,
+            'formatter': 'json',
         },
-        'posts_file': {  
+        'posts_file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'class': 'utils.log.QueuedFileHandler',
             'filename': os.path.join(BASE_DIR, 'logs/posts.log'),
+            'max_bytes': LOG_MAX_BYTES,
+            'backup_count': LOG_BACKUP_COUNT,
+            'formatter': 'json',
+            'filters': ['hot_path'],
+        },
+        'perf_file': {
+            'level': 'INFO',
+            'class': 'utils.log.QueuedFileHandler',
+            'filename': os.path.join(BASE_DIR, 'logs/perf.log'),
+            'max_bytes': LOG_MAX_BYTES,
+            'backup_count': LOG_BACKUP_COUNT,
+            'formatter': 'json',
+            'filters': ['perf_sample'],
         },
     },
     'loggers': {
@@ -163,11 +251,17 @@ LOGGING = {
             'level': 'WARNING',
             'propagate': True,
         },
-        'posts': {  
+        'posts': {
             'handlers': ['posts_file'],
             'level': 'INFO',
             'propagate': True,
         },
+        # Une ligne par requête (utils/middleware.py)
+        'perf': {
+            'handlers': ['perf_file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
 
@@ -182,6 +276,19 @@ CACHES = {
     }
 }
 
+# Durée de vie des réponses publiques des posts (invalidées à chaque écriture, voir posts/cache.py)
+POSTS_CACHE_TIMEOUT = 60 * 60
+
+# Au-delà de ce nombre de posts, la page d'un auteur est envoyée en flux (sans cache)
+POSTS_STREAM_THRESHOLD = 200
+
+# Écriture des réactions : 'direct' (Reaction et compteurs mis à jour dans la requête)
+# ou 'log' (journal ReactionEvent replié par la commande aggregate_reactions)
+REACTION_WRITE_MODE = config('REACTION_WRITE_MODE', default='direct')
+
+# Cache des utilisateurs authentifiés par refresh token (délai max avant prise en compte d'une désactivation)
+USER_CACHE_TIMEOUT = 60
+
 
 # Autres
 LANGUAGE_CODE = 'fr-fr'
@@ -0,0 +1,25 @@
+# Réglages de test : SQLite en mémoire, cache et emails locaux, aucun service externe.
+#   python manage.py test --settings=blog_backend.settings_test
+import os
+
+# Les secrets lus par settings.py ne servent à rien ici : valeurs factices si .env est absent
+for name in ('SECRET_KEY', 'PASSWORD_RESET_TOKEN_SECRET', 'EMAIL_HOST_USER', 'EMAIL_HOST_PASSWORD',
+             'DATABASE_NAME', 'DATABASE_USER', 'DATABASE_PASSWORD', 'DATABASE_HOST', 'DATABASE_PORT'):
+    os.environ.setdefault(name, f'insecure-test-{name.lower()}-0123456789abcdef')
+
+from .settings import *  # noqa: E402,F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
@@ -1,8 +1,10 @@
 from django.contrib import admin
 from django.urls import path, include
+from utils.metrics import MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('users.urls')),
     path('api/posts/', include('posts.urls')),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
 ]
\ No newline at end of file
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Post, Comment, Reaction
+from . import search
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
@@ -8,6 +9,12 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ('title', 'content')
     ordering = ('-published_at',)
 
+    def get_search_results(self, request, queryset, search_term):
+        # Même index GIN que l'API ; icontains uniquement hors PostgreSQL
+        if not search_term or not search.is_supported():
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(search_vector=search.search_query(search_term)), False
+
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('post', 'author', 'created_at')
@@ -0,0 +1,107 @@
+# posts/async_views.py
+# Versions async (ASGI) des endpoints publics en lecture. Mêmes données et même cache
+# que les vues de posts/views.py, mais sans occuper un thread pendant les attentes
+# (cache, base de données, clients lents).
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.request import Request
+from users.models import User
+from users.serializers import UserSerializer
+from .models import Tag
+from .serializers import TagSerializer
+from .cache import acached_response
+from .views import PostCursorPagination, build_post_detail, post_list_representation
+from utils.renderers import StreamingJSONRenderer, dumps
+
+
+async def _aget_or_404(queryset, **kwargs):
+    try:
+        return await queryset.aget(**kwargs)
+    except queryset.model.DoesNotExist:
+        # Même message que get_object_or_404 dans les vues synchrones
+        raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+
+
+def json_errors(view):
+    """
+    Ces vues ne passent pas par le gestionnaire d'exceptions de DRF : sans ce décorateur,
+    Http404 et les APIException levées par DRF (curseur de pagination invalide...) donnent
+    une page HTML de Django. Corps et statut identiques aux vues DRF : {"detail": ...}.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            return await view(request, *args, **kwargs)
+        except Http404 as e:
+            return JsonResponse({'detail': str(NotFound(*e.args).detail)}, status=404)
+        except APIException as e:
+            return JsonResponse({'detail': str(e.detail)}, status=e.status_code)
+    return wrapper
+
+
+@require_GET
+@json_errors
+async def post_list(request):
+    drf_request = Request(request)
+
+    async def build():
+        posts, serializer_class = post_list_representation(drf_request)
+        tag_slug = drf_request.query_params.get('tag', None)
+        if tag_slug:
+            posts = posts.filter(tags__slug=tag_slug)
+        paginator = PostCursorPagination()
+        # La pagination par curseur de DRF est synchrone : on l'exécute hors de la boucle
+        page = await sync_to_async(paginator.paginate_queryset)(posts, drf_request)
+        return paginator.get_paginated_response(serializer_class(page, many=True).data).data
+
+    return await acached_response(request, ['list'], build)
+
+
+@require_GET
+@json_errors
+async def post_detail(request, pk):
+    drf_request = Request(request)
+
+    async def build():
+        return await sync_to_async(build_post_detail)(drf_request, pk)
+
+    return await acached_response(request, [f'post:{pk}'], build)
+
+
+@require_GET
+@json_errors
+async def about_author(request, author_id):
+    """Comme AboutAuthorView : au-delà de POSTS_STREAM_THRESHOLD posts, réponse en flux non mise en cache."""
+    drf_request = Request(request)
+
+    async def build():
+        author = await _aget_or_404(User.objects.all(), pk=author_id)
+        posts, serializer_class = post_list_representation(drf_request)
+        posts = posts.filter(author=author)
+        author_data = UserSerializer(author).data
+        if await posts.acount() > getattr(settings, 'POSTS_STREAM_THRESHOLD', 200):
+            return StreamingJSONRenderer().aresponse(
+                posts, serializer_class,
+                prefix=b'{"author":' + dumps(author_data) + b',"posts":[', suffix=b']}',
+            )
+        posts = [post async for post in posts]
+        return {
+            'author': author_data,
+            'posts': serializer_class(posts, many=True).data,
+        }
+
+    return await acached_response(request, [f'author:{author_id}'], build)
+
+
+@require_GET
+@json_errors
+async def tag_list(request):
+    async def build():
+        tags = [tag async for tag in Tag.objects.all()]
+        return TagSerializer(tags, many=True).data
+
+    return await acached_response(request, ['tags'], build)
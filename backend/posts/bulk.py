@@ -0,0 +1,178 @@
+# posts/bulk.py
+# Import / export NDJSON des posts (une ligne JSON par post, tags et commentaires inclus) :
+# {"title": ..., "content": ..., "author": "<username>", "published_at": "<ISO 8601>",
+#  "tags": ["django", ...], "comments": [{"author": "<username>", "content": ...}, ...]}
+import json
+from itertools import islice
+from django.db import DatabaseError, transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from users.models import User
+from .models import Post, Comment, Tag
+from .cache import bump_on_commit
+from .search import update_search_vector
+from utils.renderers import dumps
+
+IMPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 500
+
+
+class ImportFailed(Exception):
+    """Import interrompu à la ligne `line` ; `stats` compte ce qui a déjà été validé en base."""
+
+    def __init__(self, line, message, stats):
+        super().__init__(f"ligne {line} : {message}")
+        self.line = line
+        self.message = message
+        self.stats = dict(stats)
+
+
+def export_posts_ndjson(queryset=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Génère les lignes NDJSON (bytes) en lisant les posts par blocs (curseur serveur sous PostgreSQL)."""
+    if queryset is None:
+        queryset = Post.objects.all()
+    posts = (
+        queryset.select_related('author')
+        .prefetch_related('tags', Prefetch('comments', queryset=Comment.objects.select_related('author')))
+        .order_by('pk')
+        .iterator(chunk_size=chunk_size)
+    )
+    for post in posts:
+        yield dumps({
+            'title': post.title,
+            'content': post.content,
+            'author': post.author.username,
+            'published_at': post.published_at.isoformat(),
+            'tags': [tag.name for tag in post.tags.all()],
+            'comments': [
+                {'author': comment.author.username, 'content': comment.content}
+                for comment in post.comments.all()
+            ],
+        }) + b'\n'
+
+
+def _check_text(record, field, max_length=None, required=True):
+    value = record.get(field)
+    if value is None and not required:
+        return
+    if not isinstance(value, str):
+        raise ValueError(f"champ '{field}' manquant ou non textuel")
+    if max_length is not None and len(value) > max_length:
+        raise ValueError(f"champ '{field}' trop long ({len(value)} > {max_length} caractères)")
+
+
+def validate_record(record):
+    """Vérifie un post NDJSON avant insertion (bulk_create ne valide rien). Lève ValueError."""
+    if not isinstance(record, dict):
+        raise ValueError("un objet JSON est attendu")
+    _check_text(record, 'title', Post._meta.get_field('title').max_length)
+    _check_text(record, 'content')
+    _check_text(record, 'author')
+    if record.get('published_at'):
+        _check_text(record, 'published_at')
+        # parse_datetime lève ValueError sur une date impossible et retourne None sur un format inconnu
+        try:
+            published_at = parse_datetime(record['published_at'])
+        except ValueError as e:
+            raise ValueError(f"date invalide : {record['published_at']!r} ({e})") from e
+        if published_at is None:
+            raise ValueError(f"date invalide : {record['published_at']!r}")
+        if timezone.is_naive(published_at):
+            raise ValueError(f"date sans fuseau horaire : {record['published_at']!r}")
+    tags = record.get('tags', [])
+    max_length = Tag._meta.get_field('name').max_length
+    if not isinstance(tags, list) or not all(isinstance(name, str) for name in tags):
+        raise ValueError("'tags' doit être une liste de noms")
+    for name in tags:
+        if len(name.strip()) > max_length:
+            raise ValueError(f"tag trop long ({len(name.strip())} > {max_length} caractères)")
+    comments = record.get('comments', [])
+    if not isinstance(comments, list) or not all(isinstance(comment, dict) for comment in comments):
+        raise ValueError("'comments' doit être une liste d'objets")
+    for comment in comments:
+        _check_text(comment, 'author')
+        _check_text(comment, 'content')
+
+
+def _import_batch(records, stats):
+    usernames = {record['author'] for record in records}
+    for record in records:
+        usernames.update(comment['author'] for comment in record.get('comments', []))
+    users = {user.username: user for user in User.objects.filter(username__in=usernames)}
+    tags = Tag.objects.resolve(name for record in records for name in record.get('tags', []))
+
+    records = [record for record in records if record['author'] in users]
+    now = timezone.now()
+    posts = []
+    for record in records:
+        published_at = parse_datetime(record['published_at']) if record.get('published_at') else now
+        # bulk_create n'appelle pas Post.save() : is_published est calculé ici
+        posts.append(Post(
+            title=record['title'],
+            content=record['content'],
+            author=users[record['author']],
+            published_at=published_at,
+            is_published=published_at <= now,
+        ))
+    posts = Post.objects.bulk_create(posts)
+
+    PostTag = Post.tags.through
+    PostTag.objects.bulk_create([
+        PostTag(post_id=post.pk, tag_id=tags[name.strip()].pk)
+        for post, record in zip(posts, records)
+        for name in set(record.get('tags', [])) if name.strip() in tags
+    ], ignore_conflicts=True)
+    comments = Comment.objects.bulk_create([
+        Comment(post=post, author=users[comment['author']], content=comment['content'])
+        for post, record in zip(posts, records)
+        for comment in record.get('comments', []) if comment['author'] in users
+    ])
+
+    # bulk_create ne déclenche pas les signaux : index de recherche et cache à la main
+    update_search_vector(Post.objects.filter(pk__in=[post.pk for post in posts]))
+    bump_on_commit('list', 'tags', *{f'author:{post.author_id}' for post in posts})
+
+    stats['posts'] += len(posts)
+    stats['comments'] += len(comments)
+
+
+def import_posts_ndjson(lines, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Importe des posts depuis un itérable de lignes NDJSON, par lots de `batch_size`
+    (une transaction par lot). Les posts dont l'auteur est inconnu sont ignorés.
+    Une ligne invalide ou une erreur de base lève ImportFailed : les lots précédents
+    restent importés, le lot en cours est annulé.
+    Retourne {'posts': ..., 'comments': ..., 'skipped': ...}.
+    """
+    stats = {'posts': 0, 'comments': 0, 'skipped': 0}
+
+    def records():
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                validate_record(record)
+            except ValueError as e:
+                # json.JSONDecodeError hérite de ValueError
+                raise ImportFailed(number, e, stats) from e
+            yield number, record
+
+    numbered = records()
+    while True:
+        batch = list(islice(numbered, batch_size))
+        if not batch:
+            return stats
+        committed = dict(stats)
+        try:
+            with transaction.atomic():
+                _import_batch([record for _, record in batch], stats)
+                stats['skipped'] += len(batch) - (stats['posts'] - committed['posts'])
+        except DatabaseError as e:
+            # Le lot est annulé : les compteurs reviennent à ce qui est réellement en base
+            stats.update(committed)
+            raise ImportFailed(
+                batch[0][0], f"erreur de base de données dans le lot des lignes {batch[0][0]} à {batch[-1][0]} ({e})",
+                stats,
+            ) from e
@@ -0,0 +1,120 @@
+# posts/cache.py
+import hashlib
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+from utils.renderers import dumps
+
+# Chaque réponse dépend d'un ou plusieurs "scopes" versionnés :
+#   list            -> PostListView
+#   post:<pk>       -> PostDetailView
+#   author:<id>     -> AboutAuthorView
+#   tags            -> TagListView
+# Changer la version d'un scope rend toutes ses clés obsolètes sans avoir à les énumérer.
+CACHE_TIMEOUT = getattr(settings, 'POSTS_CACHE_TIMEOUT', 60 * 60)
+
+
+def _version_key(scope):
+    return f'posts:version:{scope}'
+
+
+def get_versions(scopes):
+    keys = [_version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Version inconnue (première lecture ou éviction) : on en crée une nouvelle
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+async def aget_versions(scopes):
+    keys = [_version_key(scope) for scope in scopes]
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, uuid.uuid4().hex, None)
+            versions[key] = await cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+def bump(*scopes):
+    """Invalide les réponses des scopes donnés."""
+    cache.set_many({_version_key(scope): uuid.uuid4().hex for scope in scopes}, None)
+
+
+def bump_on_commit(*scopes):
+    # Après le commit, sinon un lecteur pourrait remettre en cache l'ancien état
+    transaction.on_commit(lambda: bump(*scopes))
+
+
+def post_scopes(post_id, author_id):
+    return ['list', f'post:{post_id}', f'author:{author_id}']
+
+
+def _response_key(request, scopes, versions):
+    raw_key = '|'.join([*scopes, *versions, request.build_absolute_uri()])
+    return 'posts:response:' + hashlib.md5(raw_key.encode()).hexdigest()
+
+
+def _make_entry(data):
+    etag = quote_etag(hashlib.md5(dumps(data)).hexdigest())
+    return {'data': data, 'etag': etag}
+
+
+def _is_not_modified(request, entry):
+    if_none_match = request.headers.get('If-None-Match')
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    return '*' in etags or entry['etag'] in etags
+
+
+def cached_response(request, scopes, build_response):
+    """
+    Sert la réponse depuis le cache si possible, sinon appelle `build_response()`
+    et met en cache son contenu (réponses 200 non streamées uniquement). Gère ETag / If-None-Match.
+    """
+    key = _response_key(request, scopes, get_versions(scopes))
+    entry = cache.get(key)
+    if entry is None:
+        response = build_response()
+        if response.status_code != status.HTTP_200_OK or response.streaming:
+            return response
+        entry = _make_entry(response.data)
+        cache.set(key, entry, CACHE_TIMEOUT)
+
+    if _is_not_modified(request, entry):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': entry['etag']})
+    return Response(entry['data'], status=status.HTTP_200_OK, headers={'ETag': entry['etag']})
+
+
+async def acached_response(request, scopes, abuild_data):
+    """
+    Variante async de `cached_response` pour les vues Django async : `abuild_data()`
+    est une coroutine qui retourne les données à sérialiser (ou lève Http404), ou une
+    réponse en flux, renvoyée telle quelle et jamais mise en cache.
+    Ni locmem ni django-redis n'ont d'API de cache async native : cache.aget/aset/...
+    sont les replis de BaseCache (sync_to_async), chaque appel passe donc par un thread.
+    """
+    key = _response_key(request, scopes, await aget_versions(scopes))
+    entry = await cache.aget(key)
+    if entry is None:
+        data = await abuild_data()
+        if isinstance(data, StreamingHttpResponse):
+            return data
+        entry = _make_entry(data)
+        await cache.aset(key, entry, CACHE_TIMEOUT)
+
+    if _is_not_modified(request, entry):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(dumps(entry['data']), content_type='application/json')
+    response['ETag'] = entry['etag']
+    return response
@@ -0,0 +1,30 @@
+import time
+from django.core.management.base import BaseCommand
+from posts.reactions import BATCH_SIZE, aggregate_reaction_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Replie les toggles de réaction journalisés (REACTION_WRITE_MODE = 'log') dans Reaction "
+        "et les compteurs des posts, par lots. Avec --loop, tourne en continu."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help="Tourne en continu.")
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help="Attente quand le journal est vide, en secondes.")
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            processed = aggregate_reaction_events(options['batch_size'])
+            total += processed
+            if processed:
+                continue
+            if total:
+                self.stdout.write(f"{total} événement(s) de réaction agrégé(s).")
+                total = 0
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
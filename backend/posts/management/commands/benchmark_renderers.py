@@ -0,0 +1,71 @@
+import time
+import tracemalloc
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from posts.models import Post
+from posts.serializers import PostSerializer
+from utils import renderers
+from utils.renderers import FastJSONRenderer, StreamingJSONRenderer, STREAM_CHUNK_SIZE
+
+
+def measure(func):
+    """(durée en secondes, pic mémoire en octets) d'un appel."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        func()
+        return time.perf_counter() - start, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare les renderers JSON sur la sortie réelle de PostSerializer (posts de la base, "
+        "voir seed_data) : JSONRenderer de DRF, FastJSONRenderer (orjson et repli stdlib), puis "
+        "sérialisation + rendu de bout en bout, en mémoire et en flux (StreamingJSONRenderer)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=500, help="Nombre de posts rendus.")
+        parser.add_argument('--repeat', type=int, default=20, help="Rendus par renderer.")
+        parser.add_argument('--chunk-size', type=int, default=STREAM_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        queryset = Post.objects.published().with_related()
+        pks = list(queryset.values_list('pk', flat=True)[:options['posts']])
+        if not pks:
+            raise CommandError("Aucun post publié : générez d'abord des données avec seed_data.")
+        queryset = queryset.filter(pk__in=pks)
+        data = PostSerializer(queryset, many=True).data
+        size = len(JSONRenderer().render(data))
+        self.stdout.write(f"{len(pks)} posts, {size / 1024:.0f} Kio de JSON")
+
+        candidates = {'drf JSONRenderer (json)': JSONRenderer().render}
+        if renderers.orjson is not None:
+            candidates['FastJSONRenderer (orjson)'] = FastJSONRenderer().render
+        else:
+            self.stdout.write(self.style.WARNING("orjson non installé : seul le repli stdlib est mesuré"))
+        candidates['FastJSONRenderer (repli stdlib)'] = lambda data: renderers.dumps(data, use_orjson=False)
+
+        baseline = None
+        for name, render in candidates.items():
+            render(data)
+            start = time.perf_counter()
+            for _ in range(options['repeat']):
+                render(data)
+            per_render = (time.perf_counter() - start) / options['repeat']
+            baseline = baseline or per_render
+            self.stdout.write(
+                f"  {name:32} {per_render * 1000:8.2f} ms/rendu  {size / per_render / 1024 ** 2:7.1f} Mio/s  "
+                f"x{baseline / per_render:.1f}"
+            )
+
+        # De bout en bout : la liste sérialisée complète en mémoire, ou des blocs de --chunk-size posts
+        self.stdout.write("Sérialisation + rendu :")
+        # .all() : un queryset neuf à chaque fois, sans le cache de résultats rempli plus haut
+        buffered = measure(lambda: FastJSONRenderer().render(PostSerializer(queryset.all(), many=True).data))
+        streamer = StreamingJSONRenderer(chunk_size=options['chunk_size'])
+        streamed = measure(lambda: sum(len(part) for part in streamer.stream(queryset.all(), PostSerializer)))
+        for name, (elapsed, peak) in (('en mémoire', buffered), (f"en flux ({options['chunk_size']}/bloc)", streamed)):
+            self.stdout.write(f"  {name:32} {elapsed * 1000:8.1f} ms  pic mémoire {peak / 1024 ** 2:6.1f} Mio")
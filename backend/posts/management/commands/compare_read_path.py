@@ -0,0 +1,106 @@
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+from django.core.management.base import BaseCommand
+
+DEFAULT_PATHS = {
+    'sync': ['/api/posts/', '/api/posts/tags/'],
+    'async': ['/api/posts/async/', '/api/posts/async/tags/'],
+}
+
+
+async def slow_request(base_url, path, send_delay, read_chunk, read_delay):
+    """
+    Requête HTTP/1.1 faite par un client lent : en-têtes envoyés en deux fois et
+    réponse lue par petits morceaux. Retourne (statut, latence en secondes).
+    """
+    url = urlsplit(base_url)
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+    try:
+        head = f"GET {path} HTTP/1.1\r\nHost: {url.netloc}\r\nConnection: close\r\n"
+        writer.write(head.encode())
+        await writer.drain()
+        await asyncio.sleep(send_delay)
+        writer.write(b"Accept: application/json\r\n\r\n")
+        await writer.drain()
+
+        status_line = await reader.readline()
+        while await reader.read(read_chunk):
+            await asyncio.sleep(read_delay)
+    finally:
+        writer.close()
+    status = int(status_line.split()[1]) if status_line else 0
+    return status, time.perf_counter() - start
+
+
+async def run_target(base_url, paths, concurrency, duration, options):
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def client(index):
+        nonlocal errors
+        i = index
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            try:
+                status, latency = await slow_request(
+                    base_url, path, options['send_delay'], options['read_chunk'], options['read_delay']
+                )
+            except OSError:
+                errors += 1
+                continue
+            if status == 200:
+                latencies.append(latency)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    return {
+        'base_url': base_url,
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(quantiles[49] * 1000, 1),
+        'p95_ms': round(quantiles[94] * 1000, 1),
+        'p99_ms': round(quantiles[98] * 1000, 1),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare le débit des endpoints de lecture en WSGI (vues sync) et en ASGI (vues async) "
+        "sous des clients lents concurrents. Les serveurs doivent déjà tourner, par exemple :\n"
+        "  gunicorn blog_backend.wsgi -b 127.0.0.1:8000 -w 1 --threads 8\n"
+        "  uvicorn blog_backend.asgi:application --port 8001"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sync-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--async-url', default='http://127.0.0.1:8001')
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--duration', type=float, default=20.0, help="Durée par cible, en secondes.")
+        parser.add_argument('--send-delay', type=float, default=0.2,
+                            help="Pause du client au milieu de l'envoi des en-têtes.")
+        parser.add_argument('--read-chunk', type=int, default=4096)
+        parser.add_argument('--read-delay', type=float, default=0.01,
+                            help="Pause du client entre deux lectures de la réponse.")
+
+    def handle(self, *args, **options):
+        results = {}
+        for mode, base_url in (('sync', options['sync_url']), ('async', options['async_url'])):
+            self.stdout.write(f"{mode}: {base_url} ({options['concurrency']} clients, {options['duration']}s)")
+            results[mode] = asyncio.run(run_target(
+                base_url, DEFAULT_PATHS[mode], options['concurrency'], options['duration'], options
+            ))
+        if results['sync']['throughput_rps']:
+            results['async_vs_sync'] = round(
+                results['async']['throughput_rps'] / results['sync']['throughput_rps'], 2
+            )
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from posts.models import Post, Comment, Reaction, Tag
+from posts.seeding import seed
+from posts import search
+
+
+class Command(BaseCommand):
+    help = (
+        "Affiche le plan d'exécution (EXPLAIN ANALYZE sous PostgreSQL) des requêtes de chaque "
+        "endpoint des posts, après avoir éventuellement généré un jeu de données volumineux."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed-posts', type=int, default=0,
+                            help="Nombre de posts à générer avant l'analyse (0 : données existantes).")
+        parser.add_argument('--seed-users', type=int, default=1000)
+        parser.add_argument('--seed-tags', type=int, default=200)
+        parser.add_argument('--comments-per-post', type=int, default=20)
+        parser.add_argument('--reactions-per-post', type=int, default=30)
+
+    def handle(self, *args, **options):
+        if options['seed_posts']:
+            created = seed(
+                users=options['seed_users'], posts=options['seed_posts'], tags=options['seed_tags'],
+                comments_per_post=options['comments_per_post'],
+                reactions_per_post=options['reactions_per_post'],
+            )
+            self.stdout.write(f"Données générées : {created}")
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute('ANALYZE')
+
+        post = Post.objects.annotate(n=Count('comments')).order_by('-n').first()
+        if post is None:
+            self.stderr.write("Aucun post : utilisez --seed-posts.")
+            return
+        tag = Tag.objects.filter(posts__isnull=False).first()
+        reaction = Reaction.objects.filter(post=post).first()
+
+        queries = {
+            'PostListView': Post.objects.published().order_by('-published_at', '-id')[:11],
+            'PostListView ?tag=': Post.objects.published().filter(tags__slug=tag.slug if tag else '')
+                                      .order_by('-published_at', '-id')[:11],
+            'PostDetailView': Post.objects.published().filter(pk=post.pk),
+            'AboutAuthorView': Post.objects.published().filter(author_id=post.author_id)
+                                   .order_by('-published_at', '-id'),
+            'CommentListView': Comment.objects.filter(post=post).order_by('created_at', 'id')[:6],
+            'ReactionToggleView (lookup)': Reaction.objects.filter(
+                post=post, user_id=reaction.user_id if reaction else 0, emoji='LIKE'),
+            'rebuild_reaction_counts (count)': Reaction.objects.filter(post=post, emoji='LIKE').values('pk'),
+        }
+        if search.is_supported():
+            queries['PostSearchView'] = search.search_posts(Post.objects.published(), post.title.split()[0]) \
+                .order_by('-rank', '-id')[:11]
+
+        analyze = connection.vendor == 'postgresql'
+        for name, queryset in queries.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {name}"))
+            plan = queryset.explain(analyze=True, buffers=True) if analyze else queryset.explain()
+            self.stdout.write(plan)
@@ -0,0 +1,22 @@
+import sys
+from django.core.management.base import BaseCommand
+from posts.bulk import export_posts_ndjson, EXPORT_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = "Exporte les posts (avec tags et commentaires) au format NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', help="Fichier de sortie (sortie standard par défaut).")
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        output = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for line in export_posts_ndjson(chunk_size=options['chunk_size']):
+                output.write(line)
+        finally:
+            if output is not sys.stdout.buffer:
+                output.close()
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f"Export terminé vers {options['output']}."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+from posts.bulk import import_posts_ndjson, ImportFailed, IMPORT_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = "Importe des posts (avec tags et commentaires) depuis un fichier NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Fichier NDJSON à importer.")
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        with open(options['path'], encoding='utf-8') as lines:
+            try:
+                stats = import_posts_ndjson(lines, batch_size=options['batch_size'])
+            except ImportFailed as e:
+                raise CommandError(
+                    f"{e} ({e.stats['posts']} posts et {e.stats['comments']} commentaires déjà importés)"
+                ) from e
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['posts']} posts et {stats['comments']} commentaires importés, "
+            f"{stats['skipped']} posts ignorés (auteur inconnu)."
+        ))
@@ -0,0 +1,245 @@
+import json
+import re
+import secrets
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.cookies import SimpleCookie
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from posts.models import Post, Tag
+from users.models import User, OutgoingEmail, PasswordResetToken
+from users.tokens import issue_refresh_token
+
+BENCH_PASSWORD = 'bench-password-123'
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) SQL"')
+
+
+class Request:
+    __slots__ = ('method', 'path', 'data', 'content_type', 'refresh_token')
+
+    def __init__(self, method, path, data=None, content_type='application/json', refresh_token=None):
+        self.method = method
+        self.path = path
+        self.data = json.dumps(data) if isinstance(data, dict) else (data or '')
+        self.content_type = content_type
+        self.refresh_token = refresh_token
+
+
+class Scenario:
+    """Données de référence et fabrique des requêtes de chaque route (hors chronométrage)."""
+
+    def __init__(self):
+        self.run = secrets.token_hex(3)
+        self.user = User(username=f'bench{self.run}', email=f'bench{self.run}@example.com', is_staff=True)
+        self.user.set_password(BENCH_PASSWORD)
+        self.user.save()
+        # Post le plus commenté : le pire cas des lectures de détail
+        self.post = (
+            Post.objects.published().annotate(n=Count('comments')).order_by('-n', '-id').first()
+            or Post.objects.create(title='Bench', content='Contenu', author=self.user)
+        )
+        # Post propre au run : cible des écritures (modification, commentaires, réactions), supprimé
+        # en cascade avec le compte ; les données existantes ne sont que lues
+        self.own_post = Post.objects.create(title=f'Bench {self.run}', content='Contenu', author=self.user)
+        self.tag_name = f'bench {self.run}'
+        tag = Tag.objects.filter(posts__isnull=False).first()
+        self.tag_slug = tag.slug if tag else ''
+
+    def token(self):
+        return str(issue_refresh_token(self.user))
+
+    def routes(self):
+        """{nom de route: fabrique(i) -> Request}, pour toutes les routes de posts/urls.py et users/urls.py."""
+        post, own_post, run = self.post, self.own_post, self.run
+        auth = self.token()
+        return {
+            'post_list': lambda i: Request('GET', reverse('post_list')),
+            'post_list_summary': lambda i: Request('GET', reverse('post_list') + '?view=summary'),
+            'post_list_tag': lambda i: Request('GET', reverse('post_list') + f'?tag={self.tag_slug}'),
+            'post_search': lambda i: Request('GET', reverse('post_search') + '?q=post'),
+            'post_detail': lambda i: Request('GET', reverse('post_detail', args=[post.pk])),
+            'comment_list': lambda i: Request('GET', reverse('comment_list', args=[post.pk])),
+            'about_author': lambda i: Request('GET', reverse('about_author', args=[post.author_id])),
+            'tag_list': lambda i: Request('GET', reverse('tag_list')),
+            'async_post_list': lambda i: Request('GET', reverse('async_post_list')),
+            'async_post_detail': lambda i: Request('GET', reverse('async_post_detail', args=[post.pk])),
+            'async_about_author': lambda i: Request('GET', reverse('async_about_author', args=[post.author_id])),
+            'async_tag_list': lambda i: Request('GET', reverse('async_tag_list')),
+            'post_create': lambda i: Request('POST', reverse('post_create'),
+                                             {'title': f'Bench {run} {i}', 'content': 'Contenu', 'tag_names': [self.tag_name]},
+                                             refresh_token=auth),
+            'post_update': lambda i: Request('PUT', reverse('post_update', args=[own_post.pk]),
+                                             {'title': f'Bench {run}', 'content': f'Contenu {i}'}, refresh_token=auth),
+            'comment_create': lambda i: Request('POST', reverse('comment_create', args=[own_post.pk]),
+                                                {'content': f'Commentaire {i}'}, refresh_token=auth),
+            'reaction_toggle': lambda i: Request('POST', reverse('reaction_toggle', args=[own_post.pk, 'LIKE']),
+                                                 refresh_token=auth),
+            'my_reactions': lambda i: Request('GET', reverse('my_reactions', args=[post.pk]), refresh_token=auth),
+            'post_export': lambda i: Request('GET', reverse('post_export'), refresh_token=auth),
+            'post_import': lambda i: Request('POST', reverse('post_import'), json.dumps({
+                'title': f'Bench import {run} {i}', 'content': 'Contenu', 'author': self.user.username,
+            }) + '\n', content_type='application/x-ndjson', refresh_token=auth),
+            'register': lambda i: Request('POST', reverse('register'), {
+                'username': f'bench{run}r{i}', 'email': f'bench{run}r{i}@example.com', 'password': BENCH_PASSWORD,
+            }),
+            'login': lambda i: Request('POST', reverse('login'),
+                                       {'username': self.user.username, 'password': BENCH_PASSWORD}),
+            'async_login': lambda i: Request('POST', reverse('async_login'),
+                                             {'username': self.user.username, 'password': BENCH_PASSWORD}),
+            # Rotation et déconnexion consomment le token : un token neuf par requête
+            'token_refresh': lambda i: Request('POST', reverse('token_refresh'), refresh_token=self.token()),
+            'logout': lambda i: Request('POST', reverse('logout'), refresh_token=self.token()),
+            'password_reset_request': lambda i: Request('POST', reverse('password_reset_request'),
+                                                        {'email': self.user.email}),
+            'password_reset_confirm': lambda i: Request(
+                'POST', reverse('password_reset_confirm', args=[PasswordResetToken.objects.create(user=self.user).token]),
+                {'password': BENCH_PASSWORD},
+            ),
+        }
+
+    def cleanup(self):
+        users = User.objects.filter(username__startswith=f'bench{self.run}')
+        emails = list(users.values_list('email', flat=True))
+        OutstandingToken.objects.filter(user__in=users).delete()
+        OutgoingEmail.objects.filter(to__in=emails).delete()
+        # Posts, commentaires, réactions et tokens des comptes de bench partent en cascade
+        users.delete()
+        Tag.objects.filter(name=self.tag_name).delete()
+
+
+def run_route(build, count, concurrency):
+    """Exécute `count` requêtes sur `concurrency` threads. Retourne les statistiques de la route."""
+    requests = [build(i) for i in range(count)]
+    local = threading.local()
+    latencies, queries, statuses = [], [], Counter()
+    lock = threading.Lock()
+
+    def send(request):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = Client(raise_request_exception=False)
+        client.cookies = SimpleCookie()
+        if request.refresh_token:
+            client.cookies['refresh_token'] = request.refresh_token
+        start = time.perf_counter()
+        response = client.generic(request.method, request.path, request.data, request.content_type)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        latency = time.perf_counter() - start
+        match = SERVER_TIMING_QUERIES.search(response.get('Server-Timing', ''))
+        with lock:
+            latencies.append(latency)
+            statuses[response.status_code] += 1
+            if match:
+                queries.append(int(match.group(1)))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, requests))
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        'requests': len(latencies),
+        'errors': sum(n for code, n in statuses.items() if code >= 400),
+        'statuses': {str(code): n for code, n in sorted(statuses.items())},
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(quantiles[49] * 1000, 2),
+        'p95_ms': round(quantiles[94] * 1000, 2),
+        'p99_ms': round(quantiles[98] * 1000, 2),
+        'queries_per_request': round(statistics.mean(queries), 2) if queries else None,
+    }
+
+
+def find_regressions(results, baseline, tolerance, min_ms):
+    """Compare deux runs route par route. Retourne la liste des régressions (texte)."""
+    regressions = []
+    for name, current in results['routes'].items():
+        previous = baseline['routes'].get(name)
+        if previous is None:
+            continue
+        if current['errors'] > previous['errors']:
+            regressions.append(f"{name}: erreurs {previous['errors']} -> {current['errors']}")
+        for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+            limit = max(previous[key] * (1 + tolerance), previous[key] + min_ms)
+            if current[key] > limit:
+                regressions.append(f"{name}: {key} {previous[key]} -> {current[key]}")
+        if current['throughput_rps'] < previous['throughput_rps'] * (1 - tolerance):
+            regressions.append(f"{name}: débit {previous['throughput_rps']} -> {current['throughput_rps']} req/s")
+        # Le nombre de requêtes SQL est déterministe : toute hausse est une régression (N+1)
+        if (current['queries_per_request'] or 0) > (previous['queries_per_request'] or 0) + 0.5:
+            regressions.append(
+                f"{name}: requêtes SQL {previous['queries_per_request']} -> {current['queries_per_request']}"
+            )
+    return regressions
+
+
+class Command(BaseCommand):
+    help = (
+        "Charge toutes les routes de posts/urls.py et users/urls.py en parallèle, dans le processus "
+        "(client de test Django, limites de débit désactivées), sur la base configurée. Affiche "
+        "p50/p95/p99, débit et requêtes SQL par requête ; --output écrit une baseline JSON, "
+        "--compare échoue si le run régresse par rapport à une baseline. Les écritures visent un "
+        "post créé pour le run ; les données créées (comptes bench*, leurs posts, le tag du run) "
+        "sont supprimées à la fin. Générez d'abord des données avec seed_data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help="Requêtes par route.")
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--route', action='append', help="Route à charger (répétable). Par défaut : toutes.")
+        parser.add_argument('--output', help="Fichier JSON où écrire les résultats (baseline).")
+        parser.add_argument('--compare', help="Baseline JSON à comparer ; échec en cas de régression.")
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help="Dégradation relative tolérée des latences et du débit.")
+        parser.add_argument('--min-ms', type=float, default=2.0,
+                            help="Écart absolu de latence toléré, en ms (bruit sur les routes rapides).")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        scenario = Scenario()
+        try:
+            routes = scenario.routes()
+            unknown = set(options['route'] or []) - set(routes)
+            if unknown:
+                raise CommandError(f"Routes inconnues : {', '.join(sorted(unknown))}")
+            results = {
+                'meta': {
+                    'requests': options['requests'],
+                    'concurrency': options['concurrency'],
+                    'posts': Post.objects.count(),
+                    'users': User.objects.count(),
+                },
+                'routes': {},
+            }
+            with override_settings(RATE_LIMITS={}):
+                for name in options['route'] or routes:
+                    stats = run_route(routes[name], options['requests'], options['concurrency'])
+                    results['routes'][name] = stats
+                    self.stdout.write(
+                        f"{name:24} p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms  "
+                        f"p99 {stats['p99_ms']:8.2f} ms  {stats['throughput_rps']:8.1f} req/s  "
+                        f"{stats['queries_per_request']} SQL/req  statuts {stats['statuses']}"
+                    )
+        finally:
+            scenario.cleanup()
+            teardown_test_environment()
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Résultats écrits dans {options['output']}")
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+            regressions = find_regressions(results, baseline, options['tolerance'], options['min_ms'])
+            if regressions:
+                raise CommandError("Régressions par rapport à la baseline :\n  " + "\n  ".join(regressions))
+            self.stdout.write(self.style.SUCCESS("Aucune régression par rapport à la baseline."))
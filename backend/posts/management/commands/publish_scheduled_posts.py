@@ -0,0 +1,59 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from posts.models import Post
+from posts.cache import bump_on_commit, post_scopes
+
+
+def publish_due_posts(now=None):
+    """Publie les posts dont published_at est atteint et invalide leurs caches. Retourne leur nombre."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        # skip_locked : plusieurs planificateurs peuvent tourner sans se bloquer
+        due = list(
+            Post.objects.select_for_update(skip_locked=True)
+            .filter(is_published=False, published_at__lte=now)
+            .values_list('pk', 'author_id')
+        )
+        if due:
+            Post.objects.filter(pk__in=[pk for pk, _ in due]).update(is_published=True)
+            scopes = set()
+            for pk, author_id in due:
+                scopes.update(post_scopes(pk, author_id))
+            bump_on_commit(*scopes)
+    return len(due)
+
+
+def next_publication():
+    return (
+        Post.objects.filter(is_published=False)
+        .order_by('published_at')
+        .values_list('published_at', flat=True)
+        .first()
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Publie les posts programmés dont la date de publication est atteinte. "
+        "Avec --loop, attend jusqu'à la prochaine publication (au plus --interval secondes)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Tourne en continu.")
+        parser.add_argument('--interval', type=float, default=60.0,
+                            help="Attente maximale entre deux vérifications, en secondes.")
+
+    def handle(self, *args, **options):
+        while True:
+            published = publish_due_posts()
+            if published:
+                self.stdout.write(f"{published} post(s) publié(s).")
+            if not options['loop']:
+                return
+            next_at = next_publication()
+            delay = options['interval']
+            if next_at is not None:
+                delay = min(delay, max(0.0, (next_at - timezone.now()).total_seconds()))
+            time.sleep(delay)
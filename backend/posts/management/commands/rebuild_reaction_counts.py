@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = "Recalcule les compteurs de réactions dénormalisés de Post à partir de la table Reaction."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Nombre de posts mis à jour par transaction.")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        pks = list(Post.objects.order_by('pk').values_list('pk', flat=True))
+        updated = 0
+        # Par lots de pk pour éviter de verrouiller toute la table
+        for start in range(0, len(pks), batch_size):
+            batch = pks[start:start + batch_size]
+            with transaction.atomic():
+                updated += Post.objects.filter(pk__in=batch).rebuild_reaction_counts()
+        self.stdout.write(self.style.SUCCESS(f"{updated} posts mis à jour."))
@@ -0,0 +1,38 @@
+import random
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from posts.seeding import BATCH_SIZE, seed
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère un jeu de données synthétique (utilisateurs, tags, posts, commentaires, réactions) "
+        "pour les benchmarks. --skew donne une distribution asymétrique, --seed le rend reproductible."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--tags', type=int, default=200)
+        parser.add_argument('--comments-per-post', type=int, default=10, help="Moyenne par post.")
+        parser.add_argument('--reactions-per-post', type=int, default=20, help="Moyenne par post.")
+        parser.add_argument('--skew', type=float, default=None,
+                            help="Exposant de Zipf/Pareto (> 1, ex. 1.2). Sans : distribution uniforme.")
+        parser.add_argument('--seed', type=int, default=None, help="Graine du générateur aléatoire.")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['skew'] is not None and options['skew'] <= 1:
+            raise CommandError("--skew doit être strictement supérieur à 1.")
+        created = seed(
+            users=options['users'], posts=options['posts'], tags=options['tags'],
+            comments_per_post=options['comments_per_post'],
+            reactions_per_post=options['reactions_per_post'],
+            batch_size=options['batch_size'],
+            rng=random.Random(options['seed']),
+            skew=options['skew'],
+        )
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        self.stdout.write(self.style.SUCCESS(f"Données générées : {created}"))
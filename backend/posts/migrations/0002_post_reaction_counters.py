@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:00
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_reaction_counts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Reaction = apps.get_model('posts', 'Reaction')
+    subqueries = {}
+    for emoji in ('LIKE', 'LOVE', 'HAHA', 'WOW', 'SAD', 'ANGRY'):
+        counts = (
+            Reaction.objects.filter(post=OuterRef('pk'), emoji=emoji)
+            .order_by().values('post')
+            .annotate(count=Count('id')).values('count')
+        )
+        subqueries[f'{emoji.lower()}_count'] = Coalesce(Subquery(counts), 0)
+    Post.objects.update(**subqueries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='angry_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='haha_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='love_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='sad_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='wow_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_reaction_counts, migrations.RunPython.noop),
+    ]
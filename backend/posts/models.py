@@ -1,15 +1,46 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Substr
 from django.utils import timezone
 from users.models import User
+from .cache import bump_on_commit
 
 
+def tag_slug(name):
+    return name.lower().replace(' ', '-')
+
+class TagQuerySet(models.QuerySet):
+    def resolve(self, names):
+        """
+        Retourne {nom: Tag} pour les noms donnés en une requête, en créant les tags
+        manquants en masse. Un conflit (tag créé en parallèle, ou slug déjà pris par
+        un autre nom) n'est pas une erreur : on réutilise le tag existant.
+        """
+        names = {name.strip() for name in names if name.strip()}
+        tags = {tag.name: tag for tag in self.filter(name__in=names)}
+        missing = names - tags.keys()
+        if missing:
+            self.bulk_create(
+                [Tag(name=name, slug=tag_slug(name)) for name in missing],
+                ignore_conflicts=True,
+            )
+            # bulk_create n'envoie pas post_save : la liste des tags en cache est invalidée ici
+            bump_on_commit('tags')
+            by_slug = {tag.slug: tag for tag in self.filter(slug__in=[tag_slug(name) for name in missing])}
+            tags.update({name: by_slug[tag_slug(name)] for name in missing if tag_slug(name) in by_slug})
+        return tags
+
 class Tag(models.Model):
     name = models.CharField(max_length=50, unique=True)
     slug = models.SlugField(max_length=50, unique=True, blank=True)
 
+    objects = TagQuerySet.as_manager()
+
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = self.name.lower().replace(' ', '-')
+            self.slug = tag_slug(self.name)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -19,6 +50,60 @@ class Tag(models.Model):
         verbose_name = "Tag"
         verbose_name_plural = "Tags"
 
+EXCERPT_LENGTH = 300
+
+class PostQuerySet(models.QuerySet):
+    def published(self):
+        """
+        Posts visibles. Le drapeau is_published (et non `published_at <= now()`) sert de
+        frontière de publication : elle ne bouge que quand publish_scheduled_posts publie
+        un post, ce qui rend les requêtes et les réponses en cache stables entre-temps.
+        Un post programmé reste donc invisible tant que le planificateur ne tourne pas
+        (voir « Tâches de fond » dans le README).
+        """
+        return self.filter(is_published=True)
+
+    def with_related(self, comments=True, reactions=True):
+        """Charge auteur, tags (et réactions, commentaires) en un nombre fixe de requêtes."""
+        queryset = self.select_related('author').prefetch_related('tags')
+        if reactions:
+            queryset = queryset.prefetch_related('reactions')
+        if comments:
+            queryset = queryset.prefetch_related(
+                models.Prefetch('comments', queryset=Comment.objects.select_related('author'))
+            )
+        return queryset
+
+    def with_comment_count(self):
+        """Annote `comment_count` via une sous-requête (pas de jointure multipliée)."""
+        comments = (
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by().values('post')
+            .annotate(count=Count('id')).values('count')
+        )
+        return self.annotate(comment_count=Coalesce(Subquery(comments), 0))
+
+    def summary(self):
+        """Représentation résumée : extrait, auteur, tags et nombre de commentaires, sans lignes imbriquées."""
+        return (
+            self.select_related('author').prefetch_related('tags')
+            .defer('content')
+            .annotate(excerpt=Substr('content', 1, EXCERPT_LENGTH))
+            .with_comment_count()
+        )
+
+    def rebuild_reaction_counts(self):
+        """Recalcule les compteurs dénormalisés depuis la table Reaction (un seul UPDATE)."""
+        counts = {}
+        for emoji, _ in Reaction.EMOJI_CHOICES:
+            subquery = (
+                Reaction.objects.filter(post=OuterRef('pk'), emoji=emoji)
+                .order_by().values('post')
+                .annotate(count=Count('id')).values('count')
+            )
+            counts[Post.reaction_count_field(emoji)] = Coalesce(Subquery(subquery), 0)
+        return self.update(**counts)
+
 class Post(models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField()
@@ -26,8 +111,37 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(default=timezone.now)
+    # Vrai une fois published_at atteint ; sert de prédicat stable à l'index partiel
+    is_published = models.BooleanField(default=True, editable=False)
     tags = models.ManyToManyField(Tag, related_name='posts', blank=True)
 
+    # Compteurs dénormalisés, maintenus par ReactionToggleView (voir rebuild_reaction_counts)
+    like_count = models.PositiveIntegerField(default=0)
+    love_count = models.PositiveIntegerField(default=0)
+    haha_count = models.PositiveIntegerField(default=0)
+    wow_count = models.PositiveIntegerField(default=0)
+    sad_count = models.PositiveIntegerField(default=0)
+    angry_count = models.PositiveIntegerField(default=0)
+
+    # Vecteur plein texte (titre + contenu), mis à jour par posts.signals via posts.search
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = PostQuerySet.as_manager()
+
+    @staticmethod
+    def reaction_count_field(emoji):
+        return f'{emoji.lower()}_count'
+
+    def get_reaction_counts(self):
+        return {
+            emoji: getattr(self, self.reaction_count_field(emoji))
+            for emoji, _ in Reaction.EMOJI_CHOICES
+        }
+
+    def save(self, *args, **kwargs):
+        self.is_published = self.published_at <= timezone.now()
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.title
 
@@ -35,6 +149,22 @@ class Post(models.Model):
         ordering = ['-published_at']
         verbose_name = "Post"
         verbose_name_plural = "Posts"
+        indexes = [
+            GinIndex(fields=['search_vector'], name='post_search_vector_idx'),
+            # Liste paginée (ORDER BY published_at DESC, id DESC)
+            models.Index(fields=['-published_at', '-id'], name='post_published_at_id_idx'),
+            models.Index(
+                fields=['-published_at', '-id'], condition=models.Q(is_published=True),
+                name='post_published_partial_idx',
+            ),
+            # Page auteur
+            models.Index(fields=['author', '-published_at', '-id'], name='post_author_published_idx'),
+            # Posts programmés en attente (publish_scheduled_posts)
+            models.Index(
+                fields=['published_at'], condition=models.Q(is_published=False),
+                name='post_scheduled_idx',
+            ),
+        ]
 
 class Comment(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
@@ -50,6 +180,10 @@ class Comment(models.Model):
         ordering = ['created_at']
         verbose_name = "Commentaire"
         verbose_name_plural = "Commentaires"
+        indexes = [
+            # Pagination par curseur des commentaires d'un post (CommentPagination)
+            models.Index(fields=['post', 'created_at', 'id'], name='comment_post_created_idx'),
+        ]
 
 class Reaction(models.Model):
     EMOJI_CHOICES = [
@@ -70,7 +204,28 @@ class Reaction(models.Model):
         unique_together = ('post', 'user', 'emoji')  
         verbose_name = "Réaction"
         verbose_name_plural = "Réactions"
+        indexes = [
+            # Comptage par emoji (rebuild_reaction_counts) ; (post, user, emoji) est couvert par unique_together
+            models.Index(fields=['post', 'emoji'], name='reaction_post_emoji_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} reacted {self.emoji} to {self.post.title}"
-    
\ No newline at end of file
+    
+
+class ReactionEvent(models.Model):
+    """
+    Toggle de réaction en attente (REACTION_WRITE_MODE = 'log'). Les événements sont
+    ajoutés par ReactionToggleView et repliés par lots dans Reaction et les compteurs
+    des posts (posts.reactions.aggregate_reaction_events).
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='+')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    emoji = models.CharField(max_length=10, choices=Reaction.EMOJI_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Toggles en attente d'un utilisateur (compteurs optimistes de la réponse)
+            models.Index(fields=['post', 'user', 'emoji'], name='reactionevent_key_idx'),
+        ]
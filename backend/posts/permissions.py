@@ -1,8 +1,9 @@
 # posts/permissions.py
 from rest_framework import permissions
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.contrib.auth import get_user_model
+from users.utils import get_cached_user
+from users.tokens import verify_refresh_token
 
 User = get_user_model()
 
@@ -16,9 +17,14 @@ class IsAuthenticatedByRefreshToken(permissions.BasePermission):
             self.message = "Aucun token trouvé dans les cookies. Veuillez vous connecter."
             return False
 
+        # Token déjà vérifié pendant cette requête : on réutilise le résultat
+        verified = getattr(request, '_refresh_token_user', None)
+        if verified and verified[0] == refresh_token:
+            request.user = verified[1]
+            return True
+
         try:
-            token = RefreshToken(refresh_token)
-            token.verify()  
+            token = verify_refresh_token(refresh_token)
 
            
             user_id = token.payload.get('user_id')
@@ -26,13 +32,14 @@ class IsAuthenticatedByRefreshToken(permissions.BasePermission):
                 self.message = "Utilisateur non trouvé dans le token."
                 return False
 
-            user = User.objects.get(id=user_id)
+            user = get_cached_user(user_id)
             if not user.is_active:
                 self.message = "Cet utilisateur est désactivé."
                 return False
 
             
             request.user = user
+            request._refresh_token_user = (refresh_token, user)
             return True
 
         except InvalidToken:
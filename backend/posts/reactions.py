@@ -0,0 +1,122 @@
+# posts/reactions.py
+# État des réactions renvoyé par ReactionToggleView, et mode d'écriture à fort débit
+# (settings.REACTION_WRITE_MODE = 'log') : un toggle n'est qu'une insertion dans
+# ReactionEvent ; un agrégateur replie ensuite les événements par lots dans Reaction
+# et dans les compteurs des posts.
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef
+from .models import Post, Reaction, ReactionEvent
+from .cache import bump_on_commit, post_scopes
+
+BATCH_SIZE = 1000
+
+
+def write_mode():
+    return getattr(settings, 'REACTION_WRITE_MODE', 'direct')
+
+
+def reaction_state(post_id, user):
+    """
+    Retourne (compteurs, émojis de l'utilisateur) pour un post, en une requête :
+    les compteurs dénormalisés et un EXISTS par émoji sur l'index unique de Reaction.
+    """
+    emojis = [emoji for emoji, _ in Reaction.EMOJI_CHOICES]
+    counters = [Post.reaction_count_field(emoji) for emoji in emojis]
+    flags = {
+        f'my_{emoji}': Exists(Reaction.objects.filter(post=OuterRef('pk'), user=user, emoji=emoji))
+        for emoji in emojis
+    }
+    row = Post.objects.filter(pk=post_id).annotate(**flags).values(*counters, *flags).get()
+    counts = {emoji: row[counter] for emoji, counter in zip(emojis, counters)}
+    return counts, [emoji for emoji in emojis if row[f'my_{emoji}']]
+
+
+def append_toggle(post, user, emoji):
+    """
+    Enregistre un toggle et retourne (compteurs optimistes, émojis de l'utilisateur).
+    Les compteurs sont ceux du post, corrigés des toggles en attente de cet utilisateur seulement.
+    """
+    ReactionEvent.objects.create(post=post, user=user, emoji=emoji)
+    pending = dict(
+        ReactionEvent.objects.filter(post=post, user=user)
+        .values('emoji').annotate(count=Count('id')).values_list('emoji', 'count')
+    )
+    existing = set(Reaction.objects.filter(post=post, user=user).values_list('emoji', flat=True))
+    counts = post.get_reaction_counts()
+    mine = []
+    for key in counts:
+        # Un nombre impair de toggles en attente inverse l'état déjà agrégé
+        reacted = (key in existing) != (pending.get(key, 0) % 2 == 1)
+        counts[key] = max(0, counts[key] + int(reacted) - int(key in existing))
+        if reacted:
+            mine.append(key)
+    return counts, mine
+
+
+def aggregate_reaction_events(batch_size=BATCH_SIZE):
+    """
+    Replie un lot d'événements, dans l'ordre d'arrivée, en une transaction.
+    Retourne le nombre d'événements traités.
+    """
+    with transaction.atomic():
+        # skip_locked : plusieurs agrégateurs peuvent se partager le journal
+        events = list(
+            ReactionEvent.objects.select_for_update(skip_locked=True)
+            .order_by('id')
+            .values_list('id', 'post_id', 'user_id', 'emoji')[:batch_size]
+        )
+        if not events:
+            return 0
+
+        # Seule la parité compte : deux toggles d'une même clé s'annulent
+        toggles = Counter((post_id, user_id, emoji) for _, post_id, user_id, emoji in events)
+        flipped = {key for key, count in toggles.items() if count % 2}
+
+        # Verrou des posts (dans l'ordre des pk, sans interblocage) : deux lots touchant
+        # le même post sont repliés l'un après l'autre
+        authors = dict(
+            Post.objects.select_for_update()
+            .filter(pk__in={post_id for post_id, _, _ in toggles})
+            .order_by('pk')
+            .values_list('pk', 'author_id')
+        )
+        existing = {}
+        if flipped:
+            candidates = Reaction.objects.filter(
+                post_id__in={post_id for post_id, _, _ in flipped},
+                user_id__in={user_id for _, user_id, _ in flipped},
+            ).values_list('pk', 'post_id', 'user_id', 'emoji')
+            existing = {(post_id, user_id, emoji): pk for pk, post_id, user_id, emoji in candidates}
+
+        deltas = defaultdict(Counter)
+        to_delete, to_create = [], []
+        for key in flipped:
+            post_id, user_id, emoji = key
+            if key in existing:
+                to_delete.append(existing[key])
+                deltas[post_id][emoji] -= 1
+            else:
+                to_create.append(Reaction(post_id=post_id, user_id=user_id, emoji=emoji))
+                deltas[post_id][emoji] += 1
+        if to_delete:
+            Reaction.objects.filter(pk__in=to_delete).delete()
+        Reaction.objects.bulk_create(to_create)
+
+        for post_id, emoji_deltas in deltas.items():
+            updates = {}
+            for emoji, delta in emoji_deltas.items():
+                if delta:
+                    counter = Post.reaction_count_field(emoji)
+                    updates[counter] = F(counter) + delta
+            if updates:
+                Post.objects.filter(pk=post_id).update(**updates)
+
+        ReactionEvent.objects.filter(pk__in=[event[0] for event in events]).delete()
+
+        scopes = set()
+        for post_id in deltas:
+            scopes.update(post_scopes(post_id, authors[post_id]))
+        bump_on_commit(*scopes)
+    return len(events)
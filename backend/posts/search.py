@@ -0,0 +1,42 @@
+# posts/search.py
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+# Les contenus du blog sont en français
+SEARCH_CONFIG = 'french'
+
+
+def is_supported():
+    return connection.vendor == 'postgresql'
+
+
+def post_search_vector():
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('content', weight='B', config=SEARCH_CONFIG)
+    )
+
+
+def search_query(text):
+    return SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+
+
+def update_search_vector(queryset):
+    """Recalcule `search_vector` en base (un seul UPDATE, sans repasser par save())."""
+    if is_supported():
+        queryset.update(search_vector=post_search_vector())
+
+
+def search_posts(queryset, text):
+    """Filtre par l'index GIN et annote `rank` et `headline` (extrait surligné)."""
+    query = search_query(text)
+    return queryset.filter(search_vector=query).annotate(
+        # double precision : le rang sert de position de curseur et doit être comparé exactement
+        rank=Cast(SearchRank(F('search_vector'), query), FloatField()),
+        headline=SearchHeadline(
+            'content', query, config=SEARCH_CONFIG,
+            start_sel='<mark>', stop_sel='</mark>', max_words=35, min_words=15,
+        ),
+    )
@@ -0,0 +1,100 @@
+# posts/seeding.py
+# Génération de données synthétiques en masse (benchmarks, plans d'exécution).
+import random
+import secrets
+from datetime import timedelta
+from itertools import accumulate
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+from users.models import User
+from .models import Post, Comment, Reaction, Tag
+from .search import update_search_vector
+from .cache import bump
+
+BATCH_SIZE = 1000
+
+
+def seed(users=100, posts=1000, tags=50, comments_per_post=10, reactions_per_post=20,
+         batch_size=BATCH_SIZE, rng=None, skew=None):
+    """
+    Crée `users` utilisateurs, `tags` tags et `posts` posts avec en moyenne
+    `comments_per_post` commentaires et `reactions_per_post` réactions chacun.
+    Avec `skew` (exposant > 1, ex. 1.2), la distribution est asymétrique comme en
+    production : quelques auteurs écrivent la plupart des posts et quelques posts
+    concentrent la plupart des commentaires et réactions.
+    Retourne le nombre de lignes créées par modèle.
+    """
+    rng = rng or random.Random()
+    run = secrets.token_hex(3)
+    now = timezone.now()
+    # Mot de passe inutilisable : pas de hachage coûteux pour des comptes factices
+    password = make_password(None)
+
+    with transaction.atomic():
+        user_objs = User.objects.bulk_create([
+            User(username=f'seed{run}u{i}', email=f'seed{run}u{i}@example.com', password=password)
+            for i in range(users)
+        ], batch_size=batch_size)
+        tag_objs = list(Tag.objects.resolve(f'seed {run} {i}' for i in range(tags)).values())
+
+    created = {'users': len(user_objs), 'tags': len(tag_objs), 'posts': 0, 'comments': 0, 'reactions': 0}
+    # Poids de Zipf (cumulés, pour un tirage en O(log n)) : le k-ième auteur écrit ~1/k^skew des posts
+    author_weights = list(accumulate(1 / rank ** skew for rank in range(1, len(user_objs) + 1))) if skew else None
+    for start in range(0, posts, batch_size):
+        count = min(batch_size, posts - start)
+        with transaction.atomic():
+            post_objs = []
+            for i in range(start, start + count):
+                published_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+                post_objs.append(Post(
+                    title=f'Post {run} {i}',
+                    content=f'Contenu du post {i}. ' * rng.randint(5, 50),
+                    author=rng.choices(user_objs, cum_weights=author_weights)[0] if skew else rng.choice(user_objs),
+                    published_at=published_at,
+                    is_published=True,
+                ))
+            post_objs = Post.objects.bulk_create(post_objs)
+
+            PostTag = Post.tags.through
+            PostTag.objects.bulk_create([
+                PostTag(post_id=post.pk, tag_id=tag.pk)
+                for post in post_objs
+                for tag in rng.sample(tag_objs, min(len(tag_objs), rng.randint(0, 3)))
+            ])
+            comments = Comment.objects.bulk_create([
+                Comment(post=post, author=rng.choice(user_objs), content=f'Commentaire {j}')
+                for post in post_objs
+                for j in range(child_count(rng, comments_per_post, skew))
+            ], batch_size=batch_size)
+            emojis = [emoji for emoji, _ in Reaction.EMOJI_CHOICES]
+            reactions = Reaction.objects.bulk_create([
+                # Utilisateurs distincts par post : (post, user, emoji) reste unique
+                Reaction(post=post, user=user, emoji=rng.choice(emojis))
+                for post in post_objs
+                for user in rng.sample(user_objs, min(len(user_objs), child_count(rng, reactions_per_post, skew)))
+            ], batch_size=batch_size)
+
+            batch = Post.objects.filter(pk__in=[post.pk for post in post_objs])
+            batch.rebuild_reaction_counts()
+            update_search_vector(batch)
+
+        created['posts'] += len(post_objs)
+        created['comments'] += len(comments)
+        created['reactions'] += len(reactions)
+    # bulk_create ne déclenche pas les signaux d'invalidation
+    bump('list', 'tags')
+    return created
+
+
+def child_count(rng, mean, skew=None):
+    """
+    Nombre de lignes enfants pour un post, de moyenne `mean` : uniforme sur 0..2 × mean,
+    ou, avec `skew`, tiré d'une loi de Pareto d'exposant skew (queue lourde, plafonnée à 50 × mean).
+    """
+    if not mean:
+        return 0
+    if not skew:
+        return rng.randint(0, 2 * mean)
+    # paretovariate(a) >= 1, de moyenne a / (a - 1) : on ramène la moyenne à `mean`
+    return min(int(mean * (skew - 1) / skew * rng.paretovariate(skew)), 50 * mean)
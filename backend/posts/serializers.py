@@ -1,21 +1,22 @@
 from rest_framework import serializers
+from utils.metrics import TimedSerializerMixin
 from .models import Post, Comment, Reaction , Tag
 from users.serializers import UserSerializer
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = ['id', 'name', 'slug']
         read_only_fields = ['id', 'slug']
 
 
-class ReactionSerializer(serializers.ModelSerializer):
+class ReactionSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Reaction
         fields = ['id', 'emoji', 'created_at']
         read_only_fields = ['id', 'created_at']
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
 
     class Meta:
@@ -23,7 +24,32 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ['id', 'content', 'author', 'created_at', 'updated_at']
         read_only_fields = ['id', 'author', 'created_at', 'updated_at']
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSummarySerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """Représentation légère pour les listes (voir Post.objects.summary())."""
+    author = UserSerializer(read_only=True)
+    tags = TagSerializer(many=True, read_only=True)
+    excerpt = serializers.CharField(read_only=True)
+    comment_count = serializers.IntegerField(read_only=True)
+    reaction_counts = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Post
+        fields = ['id', 'title', 'excerpt', 'author', 'published_at', 'tags', 'comment_count', 'reaction_counts']
+        read_only_fields = fields
+
+    def get_reaction_counts(self, obj):
+        return obj.get_reaction_counts()
+
+class PostSearchResultSerializer(PostSummarySerializer):
+    """Résultat de recherche : représentation résumée + rang et extrait surligné."""
+    rank = serializers.FloatField(read_only=True)
+    headline = serializers.CharField(read_only=True)
+
+    class Meta(PostSummarySerializer.Meta):
+        fields = PostSummarySerializer.Meta.fields + ['rank', 'headline']
+        read_only_fields = fields
+
+class PostSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     comments = CommentSerializer(many=True, read_only=True)
     reactions = ReactionSerializer(many=True, read_only=True)
@@ -42,29 +68,56 @@ class PostSerializer(serializers.ModelSerializer):
 
 
     def get_reaction_counts(self, obj):
-        counts = {}
-        for emoji, _ in Reaction.EMOJI_CHOICES:
-            counts[emoji] = obj.reactions.filter(emoji=emoji).count()
-        return counts
+        return obj.get_reaction_counts()
 
     def create(self, validated_data):
         tag_names = validated_data.pop('tag_names', [])
         post = Post.objects.create(**validated_data)
-        self._add_tags(post, tag_names)
+        tags = Tag.objects.resolve(tag_names)
+        if tags:
+            post.tags.add(*tags.values())
         return post
 
     def update(self, instance, validated_data):
         tag_names = validated_data.pop('tag_names', None)
         instance = super().update(instance, validated_data)
         if tag_names is not None:
-            instance.tags.clear()  
-            self._add_tags(instance, tag_names)
+            # set() calcule la différence : seuls les liens ajoutés / retirés sont écrits
+            instance.tags.set(Tag.objects.resolve(tag_names).values())
         return instance
 
-    def _add_tags(self, post, tag_names):
-        for tag_name in tag_names:
-            tag, created = Tag.objects.get_or_create(
-                name=tag_name.strip(),
-                defaults={'slug': tag_name.lower().replace(' ', '-')}
-            )
-            post.tags.add(tag)
\ No newline at end of file
+class PostListSerializer(PostSerializer):
+    """
+    Représentation complète des listes : contenu, tags et compteurs, sans les lignes
+    imbriquées (commentaires, réactions) dont le nombre n'est pas borné.
+    """
+    comments = None
+    reactions = None
+    comment_count = serializers.IntegerField(read_only=True)
+
+    class Meta(PostSerializer.Meta):
+        fields = [
+            field for field in PostSerializer.Meta.fields if field not in ('comments', 'reactions', 'tag_names')
+        ] + ['comment_count']
+        read_only_fields = fields
+
+class PostDetailSerializer(PostSerializer):
+    """
+    Détail d'un post : seulement la première page de commentaires, passée dans le
+    contexte (`comments`, `comments_next`), et le nombre total de commentaires.
+    Pas de liste des réactions : les compteurs dénormalisés (`reaction_counts`) suffisent,
+    les réactions de l'utilisateur se lisent sur MyReactionsView.
+    """
+    comments = serializers.SerializerMethodField()
+    reactions = None
+    comment_count = serializers.IntegerField(read_only=True)
+    comments_next = serializers.SerializerMethodField()
+
+    class Meta(PostSerializer.Meta):
+        fields = [field for field in PostSerializer.Meta.fields if field != 'reactions'] + ['comment_count', 'comments_next']
+
+    def get_comments(self, obj):
+        return CommentSerializer(self.context['comments'], many=True).data
+
+    def get_comments_next(self, obj):
+        return self.context.get('comments_next')
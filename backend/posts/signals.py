@@ -0,0 +1,64 @@
+# posts/signals.py
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+from users.models import User
+from .models import Post, Comment, Reaction, Tag
+from .cache import bump_on_commit, post_scopes
+from .search import update_search_vector
+
+
+def _scopes_for_posts(posts):
+    scopes = set()
+    for post_id, author_id in posts.values_list('pk', 'author_id'):
+        scopes.update(post_scopes(post_id, author_id))
+    return scopes
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    bump_on_commit(*post_scopes(instance.pk, instance.author_id))
+
+
+@receiver(post_save, sender=Post)
+def refresh_search_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {'title', 'content'} & set(update_fields):
+        return
+    update_search_vector(Post.objects.filter(pk=instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Comment)
+@receiver([post_save, post_delete], sender=Reaction)
+def invalidate_post_children(sender, instance, **kwargs):
+    bump_on_commit(*_scopes_for_posts(Post.objects.filter(pk=instance.post_id)))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_post_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        bump_on_commit(*post_scopes(instance.pk, instance.author_id))
+    elif pk_set:
+        bump_on_commit(*_scopes_for_posts(Post.objects.filter(pk__in=pk_set)))
+    else:
+        bump_on_commit('list')
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def invalidate_tag(sender, instance, **kwargs):
+    # pre_delete : les liens vers les posts existent encore
+    bump_on_commit('tags', *_scopes_for_posts(instance.posts.all()))
+
+
+# Champs de User absents des réponses en cache (re-hachage à la connexion, dernière connexion)
+AUTHOR_PRIVATE_FIELDS = {'password', 'last_login'}
+
+
+@receiver(post_save, sender=User)
+def invalidate_author(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    if update_fields is not None and set(update_fields) <= AUTHOR_PRIVATE_FIELDS:
+        return
+    bump_on_commit(f'author:{instance.pk}', *_scopes_for_posts(instance.posts.all()))
@@ -0,0 +1,211 @@
+# posts/tests/test_budgets.py
+# Budgets de performance par endpoint : le même appel est mesuré sur un petit jeu de données
+# puis sur un jeu beaucoup plus gros. Le nombre de requêtes SQL doit être identique (un N+1
+# dans un serializer le fait grandir avec les données) et la taille de la réponse doit rester
+# sous le budget de l'endpoint.
+import json
+import logging
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from unittest import skipUnless
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.models import User
+from posts.models import Post, Comment, Reaction, Tag
+
+logging.disable(logging.CRITICAL)
+
+# Deux échelles : nombre de posts, de commentaires par post, de lecteurs (qui commentent et
+# réagissent à chaque post) et de tags par post
+SMALL = {'posts': 3, 'comments': 2, 'readers': 2, 'tags': 1}
+LARGE = {'posts': 30, 'comments': 12, 'readers': 8, 'tags': 4}
+
+# Budgets (en octets) à l'échelle LARGE, environ 25 % au-dessus de la taille mesurée. Les listes
+# paginées sont bornées par la taille de page ; AboutAuthorView et l'export ne le sont pas et
+# grandissent avec l'auteur / la base.
+BUDGETS = {
+    'post_list': 8_500,
+    'post_list_summary': 7_500,
+    'post_search': 7_500,
+    'post_detail': 2_300,
+    'comment_list': 1_500,
+    'about_author': 25_000,
+    'about_author_summary': 22_000,
+    'tag_list': 200,
+    'async_post_list': 8_500,
+    'async_post_detail': 2_300,
+    'async_about_author': 25_000,
+    'async_tag_list': 200,
+    'post_create': 600,
+    'post_update': 4_500,
+    'comment_create': 300,
+    'reaction_toggle': 150,
+    'my_reactions': 110,
+    'post_export': 35_000,
+    'post_import': 100,
+}
+
+
+@override_settings(RATE_LIMITS={})
+class EndpointBudgetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create(username='admin', email='admin@example.com', is_staff=True)
+        self.readers, self.tags, self.posts = [], [], []
+        self.voters = self.created = 0
+
+    def grow(self, posts, comments, readers, tags):
+        """Complète le jeu de données jusqu'à l'échelle donnée (les objets existants grossissent aussi)."""
+        while len(self.readers) < readers:
+            n = len(self.readers)
+            self.readers.append(User.objects.create(username=f'reader{n}', email=f'reader{n}@example.com'))
+        while len(self.tags) < tags:
+            self.tags.append(Tag.objects.create(name=f'tag{len(self.tags)}'))
+        while len(self.posts) < posts:
+            self.posts.append(Post.objects.create(
+                title=f'Post {len(self.posts)}', content='Contenu ' * 20, author=self.admin
+            ))
+        for post in self.posts:
+            post.tags.set(self.tags)
+            existing = post.comments.count()
+            Comment.objects.bulk_create([
+                Comment(post=post, author=self.readers[i % len(self.readers)], content=f'Commentaire {i}')
+                for i in range(existing, comments)
+            ])
+            Reaction.objects.bulk_create(
+                [Reaction(post=post, user=reader, emoji='LIKE') for reader in self.readers],
+                ignore_conflicts=True,
+            )
+        Post.objects.rebuild_reaction_counts()
+
+    def authenticate(self, user):
+        self.client.cookies['refresh_token'] = str(RefreshToken.for_user(user))
+
+    def new_voter(self):
+        # Un utilisateur sans réaction : chaque toggle suit le même chemin (création)
+        self.voters += 1
+        return User.objects.create(username=f'voter{self.voters}', email=f'voter{self.voters}@example.com')
+
+    def measure(self, send):
+        """(statut, nombre de requêtes SQL, taille du corps) d'un appel, cache vidé au préalable."""
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            response = send()
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response.status_code, len(ctx.captured_queries), len(body)
+
+    def assertWithinBudget(self, endpoint, send, expected_status=200):
+        self.grow(**SMALL)
+        small_status, small_queries, _ = self.measure(send)
+        self.grow(**LARGE)
+        large_status, large_queries, size = self.measure(send)
+
+        self.assertEqual((small_status, large_status), (expected_status, expected_status))
+        self.assertEqual(
+            small_queries, large_queries,
+            f"{endpoint} : {small_queries} requêtes SQL à petite échelle, {large_queries} à grande échelle",
+        )
+        self.assertLessEqual(size, BUDGETS[endpoint], f"{endpoint} : {size} octets (budget {BUDGETS[endpoint]})")
+
+    @property
+    def hot_post(self):
+        return self.posts[0]
+
+    # Lectures publiques
+
+    def test_post_list(self):
+        self.assertWithinBudget('post_list', lambda: self.client.get(reverse('post_list')))
+
+    def test_post_list_summary(self):
+        self.assertWithinBudget('post_list_summary', lambda: self.client.get(reverse('post_list') + '?view=summary'))
+
+    @skipUnless(connection.vendor == 'postgresql', 'Recherche plein texte : PostgreSQL uniquement')
+    def test_post_search(self):
+        self.assertWithinBudget('post_search', lambda: self.client.get(reverse('post_search') + '?q=contenu'))
+
+    def test_post_detail(self):
+        self.assertWithinBudget('post_detail', lambda: self.client.get(reverse('post_detail', args=[self.hot_post.pk])))
+
+    def test_comment_list(self):
+        self.assertWithinBudget('comment_list', lambda: self.client.get(reverse('comment_list', args=[self.hot_post.pk])))
+
+    def test_about_author(self):
+        self.assertWithinBudget('about_author', lambda: self.client.get(reverse('about_author', args=[self.admin.pk])))
+
+    def test_about_author_summary(self):
+        self.assertWithinBudget(
+            'about_author_summary',
+            lambda: self.client.get(reverse('about_author', args=[self.admin.pk]) + '?view=summary'),
+        )
+
+    def test_tag_list(self):
+        self.assertWithinBudget('tag_list', lambda: self.client.get(reverse('tag_list')))
+
+    def test_async_post_list(self):
+        self.assertWithinBudget('async_post_list', lambda: self.client.get(reverse('async_post_list')))
+
+    def test_async_post_detail(self):
+        self.assertWithinBudget(
+            'async_post_detail', lambda: self.client.get(reverse('async_post_detail', args=[self.hot_post.pk]))
+        )
+
+    def test_async_about_author(self):
+        self.assertWithinBudget(
+            'async_about_author', lambda: self.client.get(reverse('async_about_author', args=[self.admin.pk]))
+        )
+
+    def test_async_tag_list(self):
+        self.assertWithinBudget('async_tag_list', lambda: self.client.get(reverse('async_tag_list')))
+
+    # Écritures authentifiées
+
+    def test_post_create(self):
+        def send():
+            # Un tag existant et un tag nouveau à chaque appel
+            self.created += 1
+            return self.client.post(reverse('post_create'), {
+                'title': 'Nouveau', 'content': 'Contenu', 'tag_names': ['tag0', f'neuf{self.created}'],
+            }, format='json')
+        self.authenticate(self.admin)
+        self.assertWithinBudget('post_create', send, expected_status=201)
+
+    def test_post_update(self):
+        self.authenticate(self.admin)
+        self.assertWithinBudget('post_update', lambda: self.client.put(
+            reverse('post_update', args=[self.hot_post.pk]), {'title': 'Modifié', 'content': 'Nouveau contenu'},
+            format='json',
+        ))
+
+    def test_comment_create(self):
+        self.authenticate(self.admin)
+        self.assertWithinBudget('comment_create', lambda: self.client.post(
+            reverse('comment_create', args=[self.hot_post.pk]), {'content': 'Un commentaire'}, format='json',
+        ), expected_status=201)
+
+    def test_reaction_toggle(self):
+        def send():
+            self.authenticate(self.new_voter())
+            return self.client.post(reverse('reaction_toggle', args=[self.hot_post.pk, 'LIKE']))
+        self.assertWithinBudget('reaction_toggle', send)
+
+    def test_my_reactions(self):
+        self.authenticate(self.admin)
+        self.assertWithinBudget('my_reactions', lambda: self.client.get(reverse('my_reactions', args=[self.hot_post.pk])))
+
+    def test_post_export(self):
+        self.authenticate(self.admin)
+        self.assertWithinBudget('post_export', lambda: self.client.get(reverse('post_export')))
+
+    def test_post_import(self):
+        self.authenticate(self.admin)
+        line = json.dumps({
+            'title': 'Importé', 'content': 'Contenu', 'author': 'admin', 'tags': ['tag0'],
+            'comments': [{'author': 'admin', 'content': 'Commentaire'}],
+        })
+        self.assertWithinBudget('post_import', lambda: self.client.generic(
+            'POST', reverse('post_import'), line + '\n', content_type='application/x-ndjson',
+        ), expected_status=201)
@@ -0,0 +1,87 @@
+# posts/tests/test_logging.py
+import json
+import logging
+import os
+import tempfile
+from unittest import mock
+from django.test import SimpleTestCase
+from utils.log import JsonFormatter, QueuedFileHandler, RateLimitFilter
+
+
+def make_record(msg, level=logging.INFO, created=None, **extra):
+    record = logging.makeLogRecord({
+        'name': 'posts', 'levelno': level, 'levelname': logging.getLevelName(level),
+        'msg': msg, 'pathname': 'posts/views.py', 'lineno': 42, **extra,
+    })
+    if created is not None:
+        record.created = created
+    return record
+
+
+class QueuedFileHandlerTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'posts.log')
+
+    def make_handler(self, **kwargs):
+        handler = QueuedFileHandler(self.path, **kwargs)
+        handler.setFormatter(JsonFormatter())
+        self.addCleanup(handler.close)
+        return handler
+
+    def test_writes_json_lines_from_writer_thread(self):
+        handler = self.make_handler()
+        handler.handle(make_record('Post créé par %s', args=('alice',), view='post_create'))
+        handler.handle(make_record('Deuxième'))
+        handler.flush_queue()
+
+        with open(self.path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([line['message'] for line in lines], ['Post créé par alice', 'Deuxième'])
+        self.assertEqual(lines[0]['view'], 'post_create')
+        self.assertEqual(lines[0]['level'], 'INFO')
+
+    def test_rotates_by_size(self):
+        handler = self.make_handler(max_bytes=200, backup_count=2)
+        for i in range(20):
+            handler.handle(make_record(f'Message {i} ' + 'x' * 50))
+            handler.flush_queue()
+        self.assertTrue(os.path.exists(self.path + '.1'))
+        self.assertFalse(os.path.exists(self.path + '.3'))
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = self.make_handler(queue_size=2)
+        # Pas de thread d'écriture : la file n'est jamais vidée
+        handler._pid = os.getpid()
+        for i in range(5):
+            handler.handle(make_record(f'Message {i}'))
+        self.assertEqual(handler.dropped, 3)
+
+    def test_write_error_does_not_stop_writer_thread(self):
+        handler = self.make_handler()
+        real_open = handler.target._open
+        with mock.patch.object(handler.target, '_open', side_effect=[OSError('disque plein'), real_open()]), \
+                mock.patch.object(handler.target, 'handleError') as handle_error:
+            handler.handle(make_record('Perdu'))
+            handler.flush_queue()
+            handler.handle(make_record('Écrit'))
+            handler.flush_queue()
+
+        handle_error.assert_called_once()
+        self.assertTrue(handler._thread.is_alive())
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual([json.loads(line)['message'] for line in f], ['Écrit'])
+
+
+class RateLimitFilterTests(SimpleTestCase):
+    def test_limits_per_call_site_and_reports_suppressed(self):
+        log_filter = RateLimitFilter(per_second=2)
+        passed = [log_filter.filter(make_record('Chemin chaud', created=1000.1)) for _ in range(5)]
+        self.assertEqual(passed, [True, True, False, False, False])
+
+        record = make_record('Chemin chaud', created=1001.0)
+        self.assertTrue(log_filter.filter(record))
+        self.assertEqual(record.suppressed, 3)
+        # Les avertissements ne sont jamais limités
+        self.assertTrue(log_filter.filter(make_record('Erreur', level=logging.WARNING, created=1001.0)))
@@ -0,0 +1,893 @@
+# posts/tests/test_views.py
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.core.cache import cache
+from django.test.utils import CaptureQueriesContext
+from django.db import connection, DatabaseError
+from django.db.models import Count
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from django.core.management import call_command
+from io import StringIO
+import json
+import os
+import random
+import tempfile
+import threading
+from collections import Counter
+from contextlib import nullcontext
+from unittest import mock, skipUnless
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.base import BaseHandler
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.models import User
+from posts.models import Post, Comment, Reaction, ReactionEvent, Tag
+from posts.reactions import append_toggle, aggregate_reaction_events, reaction_state
+from posts.management.commands.load_test import Scenario, find_regressions
+from posts import bulk
+from posts.bulk import import_posts_ndjson, ImportFailed
+from utils.metrics import registry
+from utils.renderers import FastJSONRenderer, StreamingJSONRenderer, dumps
+from posts.serializers import PostSerializer
+import logging
+
+# Désactiver les logs pendant les tests pour éviter le bruit
+logging.disable(logging.CRITICAL)
+
+
+def create_posts(author, count, comments_per_post=2):
+    tag, _ = Tag.objects.get_or_create(name='django')
+    for i in range(count):
+        post = Post.objects.create(title=f'Post {i}', content='Contenu', author=author)
+        post.tags.add(tag)
+        for j in range(comments_per_post):
+            Comment.objects.create(post=post, author=author, content=f'Commentaire {j}')
+        Reaction.objects.create(post=post, user=author, emoji='LIKE')
+        post.like_count = 1
+        post.save(update_fields=['like_count'])
+
+
+class PostListViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.list_url = reverse('post_list')
+        self.user = User(username='author', email='author@example.com')
+        self.user.set_password('TestPassword123')
+        self.user.save()
+
+    def test_list_is_paginated(self):
+        create_posts(self.user, 15)
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('results', response.data)
+        self.assertIn('next', response.data)
+        self.assertEqual(len(response.data['results']), 10)
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertIsNone(response.data['next'])
+
+    def test_list_reaction_counts(self):
+        create_posts(self.user, 1)
+        response = self.client.get(self.list_url)
+        counts = response.data['results'][0]['reaction_counts']
+        self.assertEqual(counts['LIKE'], 1)
+        self.assertEqual(counts['LOVE'], 0)
+
+    def test_list_does_not_embed_comments_or_reactions(self):
+        create_posts(self.user, 1, comments_per_post=3)
+        post = self.client.get(self.list_url).data['results'][0]
+        self.assertNotIn('comments', post)
+        self.assertNotIn('reactions', post)
+        self.assertEqual(post['comment_count'], 3)
+        self.assertEqual(post['content'], 'Contenu')
+
+    def test_list_query_count_is_constant(self):
+        create_posts(self.user, 3)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.list_url)
+
+        create_posts(self.user, 20, comments_per_post=5)
+        cache.clear()
+        with CaptureQueriesContext(connection) as large:
+            self.client.get(self.list_url)
+
+        self.assertEqual(len(small), len(large))
+
+    def test_list_summary_view(self):
+        create_posts(self.user, 2, comments_per_post=3)
+        response = self.client.get(self.list_url, {'view': 'summary'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        post = response.data['results'][0]
+        self.assertNotIn('comments', post)
+        self.assertNotIn('reactions', post)
+        self.assertEqual(post['excerpt'], 'Contenu')
+        self.assertEqual(post['comment_count'], 3)
+        self.assertEqual(post['reaction_counts']['LIKE'], 1)
+
+
+class AboutAuthorViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User(username='author', email='author@example.com')
+        self.user.set_password('TestPassword123')
+        self.user.save()
+        self.author_url = reverse('about_author', args=[self.user.id])
+
+    def test_author_summary_view(self):
+        create_posts(self.user, 2)
+        response = self.client.get(self.author_url, {'view': 'summary'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['posts']), 2)
+        self.assertIn('comment_count', response.data['posts'][0])
+        self.assertNotIn('comments', response.data['posts'][0])
+
+
+class ReactionToggleViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User(username='reader', email='reader@example.com')
+        self.user.set_password('TestPassword123')
+        self.user.save()
+        self.post = Post.objects.create(title='Post', content='Contenu', author=self.user)
+        self.react_url = reverse('reaction_toggle', args=[self.post.id, 'LIKE'])
+        self.client.cookies['refresh_token'] = str(RefreshToken.for_user(self.user))
+
+    def test_toggle_updates_counter(self):
+        response = self.client.post(self.react_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['counts']['LIKE'], 1)
+        self.assertEqual(response.data['my_reactions'], ['LIKE'])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 1)
+
+        response = self.client.post(self.react_url)
+        self.assertEqual(response.data['counts']['LIKE'], 0)
+        self.assertEqual(response.data['my_reactions'], [])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 0)
+        self.assertFalse(Reaction.objects.filter(post=self.post).exists())
+
+    def test_compact_response_in_one_query(self):
+        Reaction.objects.create(post=self.post, user=self.user, emoji='WOW')
+        Post.objects.filter(pk=self.post.pk).rebuild_reaction_counts()
+        response = self.client.post(self.react_url)
+        self.assertEqual(response.data, {
+            'counts': {'LIKE': 1, 'LOVE': 0, 'HAHA': 0, 'WOW': 1, 'SAD': 0, 'ANGRY': 0},
+            'my_reactions': ['LIKE', 'WOW'],
+        })
+        with self.assertNumQueries(1):
+            reaction_state(self.post.pk, self.user)
+
+    def test_full_response_is_opt_in(self):
+        response = self.client.post(self.react_url + '?full=1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], self.post.id)
+        self.assertEqual(response.data['reaction_counts']['LIKE'], 1)
+        self.assertIn('content', response.data)
+
+    def test_invalid_emoji(self):
+        url = reverse('reaction_toggle', args=[self.post.id, 'NOPE'])
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_reaction_counts(self):
+        Reaction.objects.create(post=self.post, user=self.user, emoji='WOW')
+        Post.objects.filter(pk=self.post.pk).update(like_count=7)
+        call_command('rebuild_reaction_counts', stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.get_reaction_counts()['WOW'], 1)
+        self.assertEqual(self.post.like_count, 0)
+
+
+class PostCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.list_url = reverse('post_list')
+        self.user = User(username='author', email='author@example.com')
+        self.user.set_password('TestPassword123')
+        self.user.save()
+        create_posts(self.user, 2)
+        self.post = Post.objects.first()
+
+    def test_warm_read_does_not_query_database(self):
+        self.client.get(self.list_url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', response)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get(self.list_url)['ETag']
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_comment_invalidates_detail(self):
+        detail_url = reverse('post_detail', args=[self.post.id])
+        etag = self.client.get(detail_url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(post=self.post, author=self.user, content='Nouveau')
+        response = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['comments']), 3)
+
+    def test_tag_change_invalidates_tag_list(self):
+        tags_url = reverse('tag_list')
+        self.assertEqual(len(self.client.get(tags_url).data), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(name='python')
+        self.assertEqual(len(self.client.get(tags_url).data), 2)
+
+
+class RefreshTokenPermissionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User(username='reader', email='reader@example.com')
+        self.user.set_password('TestPassword123')
+        self.user.save()
+        self.post = Post.objects.create(title='Post', content='Contenu', author=self.user)
+        self.comment_url = reverse('comment_create', args=[self.post.id])
+        self.client.cookies['refresh_token'] = str(RefreshToken.for_user(self.user))
+
+    def test_user_lookup_is_cached(self):
+        # Comme le frontend, qui envoie aussi l'access token en Bearer
+        access = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.client.post(self.comment_url, {'content': 'Premier'}, format='json')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.comment_url, {'content': 'Second'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(any('FROM "users_user"' in q['sql'] for q in queries.captured_queries))
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.post(self.comment_url, {'content': 'Premier'}, format='json')
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post(self.comment_url, {'content': 'Second'}, format='json')
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+        self.assertEqual(Comment.objects.filter(post=self.post).count(), 1)
+
+
+class PostSearchViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.search_url = reverse('post_search')
+
+    def test_search_requires_query(self):
+        response = self.client.get(self.search_url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @skipUnless(connection.vendor == 'postgresql', "Recherche plein texte PostgreSQL")
+    def test_search_ranks_and_highlights(self):
+        user = User.objects.create(username='author', email='author@example.com')
+        Post.objects.create(title='Django et PostgreSQL', content='Index GIN pour la recherche.', author=user)
+        Post.objects.create(title='Autre sujet', content='Un mot sur Django.', author=user)
+        Post.objects.create(title='Rien à voir', content='Cuisine.', author=user)
+        response = self.client.get(self.search_url, {'q': 'django'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]['title'], 'Django et PostgreSQL')
+        self.assertGreaterEqual(results[0]['rank'], results[1]['rank'])
+        self.assertIn('headline', results[0])
+
+
+class BulkImportExportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User(username='admin', email='admin@example.com', is_staff=True)
+        self.admin.set_password('TestPassword123')
+        self.admin.save()
+        self.client.cookies['refresh_token'] = str(RefreshToken.for_user(self.admin))
+
+    def test_export_then_import_roundtrip(self):
+        create_posts(self.admin, 3)
+        response = self.client.get(reverse('post_export'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = b''.join(response.streaming_content)
+        self.assertEqual(len(body.splitlines()), 3)
+
+        response = self.client.post(reverse('post_import'), body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {'posts': 3, 'comments': 6, 'skipped': 0})
+        self.assertEqual(Post.objects.count(), 6)
+        self.assertEqual(Tag.objects.count(), 1)
+        self.assertEqual(Post.tags.through.objects.count(), 6)
+
+    def test_import_command_skips_unknown_author(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson', encoding='utf-8', delete=False) as f:
+            path = f.name
+            f.write('{"title": "A", "content": "x", "author": "admin", "tags": ["Python", "Django"]}\n')
+            f.write('{"title": "B", "content": "y", "author": "inconnu"}\n')
+        try:
+            call_command('import_posts', path, batch_size=1, stdout=StringIO())
+        finally:
+            os.remove(path)
+        post = Post.objects.get()
+        self.assertEqual(sorted(post.tags.values_list('slug', flat=True)), ['django', 'python'])
+
+    def ndjson(self, *records):
+        return [json.dumps(record) + '\n' for record in records]
+
+    def test_import_rejects_invalid_line_with_committed_counts(self):
+        good = {'title': 'A', 'content': 'x', 'author': 'admin', 'published_at': '2024-01-01T10:00:00+00:00'}
+        for bad, error in (
+            (dict(good, published_at='2024-13-45T10:00:00+00:00'), 'date'),
+            (dict(good, published_at='hier'), 'date'),
+            (dict(good, published_at='2024-01-01T10:00:00'), 'fuseau'),
+            (dict(good, title='t' * 201), 'title'),
+            (dict(good, tags=['x' * 51]), 'tag'),
+        ):
+            with self.subTest(bad=bad), self.assertRaises(ImportFailed) as ctx:
+                import_posts_ndjson(self.ndjson(good, good, good, bad, good), batch_size=2)
+            self.assertEqual(ctx.exception.line, 4)
+            self.assertIn(error, str(ctx.exception))
+            # Le premier lot (lignes 1-2) est validé, le second est annulé avant insertion
+            self.assertEqual(ctx.exception.stats['posts'], 2)
+            self.assertEqual(Post.objects.count(), 2)
+            Post.objects.all().delete()
+
+    def test_import_database_error_rolls_back_batch(self):
+        record = {'title': 'A', 'content': 'x', 'author': 'admin'}
+        import_batch = bulk._import_batch
+
+        def fail_second_batch(records, stats):
+            if stats['posts']:
+                raise DatabaseError('contrainte violée')
+            import_batch(records, stats)
+
+        with mock.patch('posts.bulk._import_batch', side_effect=fail_second_batch):
+            with self.assertRaises(ImportFailed) as ctx:
+                import_posts_ndjson(self.ndjson(*[record] * 4), batch_size=2)
+        self.assertEqual(ctx.exception.line, 3)
+        self.assertEqual(ctx.exception.stats, {'posts': 2, 'comments': 0, 'skipped': 0})
+        self.assertEqual(Post.objects.count(), 2)
+
+    def test_import_view_reports_line_and_imported_counts(self):
+        body = ''.join(self.ndjson(
+            {'title': 'A', 'content': 'x', 'author': 'admin'},
+            {'title': 'B', 'content': 'y', 'author': 'admin', 'published_at': 'pas une date'},
+        ))
+        response = self.client.post(reverse('post_import'), body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['line'], 2)
+        self.assertEqual(response.data['imported'], {'posts': 0, 'comments': 0, 'skipped': 0})
+        self.assertFalse(Post.objects.exists())
+
+    def test_import_requires_admin(self):
+        self.client.cookies.clear()
+        response = self.client.post(reverse('post_import'), b'', content_type='application/x-ndjson')
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+
+class PostTagsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User(username='admin', email='admin@example.com', is_staff=True)
+        self.admin.set_password('TestPassword123')
+        self.admin.save()
+        self.client.cookies['refresh_token'] = str(RefreshToken.for_user(self.admin))
+
+    def create_post(self, tag_names):
+        data = {'title': 'Post', 'content': 'Contenu', 'tag_names': tag_names}
+        return self.client.post(reverse('post_create'), data, format='json')
+
+    def test_create_query_count_does_not_depend_on_tags(self):
+        self.create_post([])
+        with CaptureQueriesContext(connection) as few:
+            self.create_post(['a', 'b'])
+        with CaptureQueriesContext(connection) as many:
+            self.create_post([f'tag {i}' for i in range(10)])
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(Tag.objects.get(name='tag 3').slug, 'tag-3')
+
+    def test_update_only_changes_diff(self):
+        post_id = self.create_post(['a', 'b', 'c']).data['id']
+        kept = set(Post.tags.through.objects.filter(tag__name__in=['a', 'b']).values_list('pk', flat=True))
+        response = self.client.put(reverse('post_update', args=[post_id]), {'tag_names': ['a', 'b', 'd']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(tag['name'] for tag in response.data['tags']), ['a', 'b', 'd'])
+        # Les liens conservés ne sont pas supprimés puis recréés
+        self.assertEqual(kept, set(Post.tags.through.objects.filter(tag__name__in=['a', 'b']).values_list('pk', flat=True)))
+
+    def test_existing_slug_is_reused(self):
+        Tag.objects.create(name='Django')
+        response = self.create_post(['django'])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Tag.objects.count(), 1)
+        self.assertEqual(response.data['tags'][0]['name'], 'Django')
+
+    def test_new_tag_invalidates_cached_tag_lists(self):
+        for name in ('tag_list', 'async_tag_list'):
+            self.assertEqual(self.client.get(reverse(name)).json(), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_post(['Nouveau'])
+        for name in ('tag_list', 'async_tag_list'):
+            self.assertEqual([tag['name'] for tag in self.client.get(reverse(name)).json()], ['Nouveau'])
+
+
+class AsyncReadViewsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User(username='author', email='author@example.com')
+        self.user.set_password('TestPassword123')
+        self.user.save()
+        create_posts(self.user, 12)
+        self.post = Post.objects.first()
+
+    async def test_async_list_matches_sync(self):
+        response = await self.async_client.get(reverse('async_post_list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(len(data['results']), 10)
+        self.assertIsNotNone(data['next'])
+        self.assertIn('ETag', response)
+
+    async def test_async_detail_and_404(self):
+        response = await self.async_client.get(reverse('async_post_detail', args=[self.post.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['title'], self.post.title)
+        response = await self.async_client.get(reverse('async_post_detail', args=[0]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        # Même corps JSON que la vue DRF synchrone, pas la page HTML de Django
+        sync_response = await self.async_client.get(reverse('post_detail', args=[0]))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json(), sync_response.json())
+
+    async def test_async_author_404_is_json(self):
+        response = await self.async_client.get(reverse('async_about_author', args=[0]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), {'detail': 'No User matches the given query.'})
+
+    async def test_async_bad_cursor_is_json_404(self):
+        for name, args in (('post_list', []), ('post_detail', [self.post.id])):
+            with self.subTest(view=name):
+                response = await self.async_client.get(reverse(f'async_{name}', args=args), {'cursor': 'garbage'})
+                sync_response = await self.async_client.get(reverse(name, args=args), {'cursor': 'garbage'})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+                self.assertEqual(response['Content-Type'], 'application/json')
+                self.assertEqual(response.json(), sync_response.json())
+
+    async def test_async_large_author_page_is_streamed(self):
+        url = reverse('async_about_author', args=[self.user.id])
+        expected = (await self.async_client.get(url)).json()
+
+        await cache.aclear()
+        with override_settings(POSTS_STREAM_THRESHOLD=2):
+            response = await self.async_client.get(url)
+            self.assertTrue(response.streaming)
+            body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(json.loads(body), expected)
+
+    async def test_async_author_and_tags(self):
+        response = await self.async_client.get(reverse('async_about_author', args=[self.user.id]), {'view': 'summary'})
+        self.assertEqual(len(response.json()['posts']), 12)
+        response = await self.async_client.get(reverse('async_tag_list'))
+        self.assertEqual(response.json()[0]['name'], 'django')
+
+    async def test_async_if_none_match(self):
+        response = await self.async_client.get(reverse('async_tag_list'))
+        response = await self.async_client.get(reverse('async_tag_list'), headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class CommentPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User(username='author', email='author@example.com')
+        self.user.set_password('TestPassword123')
+        self.user.save()
+        create_posts(self.user, 1, comments_per_post=12)
+        self.post = Post.objects.get()
+
+    def test_detail_embeds_first_page(self):
+        response = self.client.get(reverse('post_detail', args=[self.post.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['comments']), 5)
+        self.assertEqual(response.data['comment_count'], 12)
+        self.assertIn(reverse('comment_list', args=[self.post.id]), response.data['comments_next'])
+
+    def test_comment_list_walks_all_pages(self):
+        contents = []
+        url = reverse('comment_list', args=[self.post.id])
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            contents += [comment['content'] for comment in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(contents, [f'Commentaire {i}' for i in range(12)])
+
+    def test_detail_query_count_does_not_depend_on_comments(self):
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(reverse('post_detail', args=[self.post.id]))
+        for i in range(30):
+            Comment.objects.create(post=self.post, author=self.user, content='Encore')
+        cache.clear()
+        with CaptureQueriesContext(connection) as many:
+            self.client.get(reverse('post_detail', args=[self.post.id]))
+        self.assertEqual(len(few), len(many))
+
+    def test_detail_uses_counters_and_my_reactions_endpoint(self):
+        readers = [User.objects.create(username=f'reader{i}', email=f'reader{i}@example.com') for i in range(20)]
+        Reaction.objects.bulk_create([Reaction(post=self.post, user=reader, emoji='LOVE') for reader in readers])
+        Post.objects.rebuild_reaction_counts()
+
+        response = self.client.get(reverse('post_detail', args=[self.post.id]))
+        self.assertNotIn('reactions', response.data)
+        self.assertEqual(response.data['reaction_counts']['LOVE'], 20)
+
+        self.client.cookies['refresh_token'] = str(RefreshToken.for_user(readers[0]))
+        response = self.client.get(reverse('my_reactions', args=[self.post.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['my_reactions'], ['LOVE'])
+        self.assertEqual(response.data['counts']['LOVE'], 20)
+
+
+class ScheduledPublishingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User(username='author', email='author@example.com')
+        self.user.set_password('TestPassword123')
+        self.user.save()
+        self.post = Post.objects.create(
+            title='Programmé', content='Contenu', author=self.user,
+            published_at=timezone.now() + timedelta(hours=1),
+        )
+
+    def test_scheduled_post_is_hidden(self):
+        self.assertFalse(self.post.is_published)
+        self.assertEqual(self.client.get(reverse('post_list')).data['results'], [])
+        response = self.client.get(reverse('post_detail', args=[self.post.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(reverse('about_author', args=[self.user.id]))
+        self.assertEqual(response.data['posts'], [])
+
+    def test_scheduler_publishes_and_invalidates(self):
+        list_url = reverse('post_list')
+        self.assertEqual(self.client.get(list_url).data['results'], [])
+        Post.objects.filter(pk=self.post.pk).update(published_at=timezone.now() - timedelta(seconds=1))
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('publish_scheduled_posts', stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertTrue(self.post.is_published)
+        self.assertEqual(len(self.client.get(list_url).data['results']), 1)
+
+
+@override_settings(RATE_LIMITS={'reactions': {'user': '2/m', 'ip': '3/m'}, 'comments': {'user': '1/m'}})
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create(username='reader', email='reader@example.com')
+        self.post = Post.objects.create(title='Post', content='Contenu', author=self.user)
+        self.client.cookies['refresh_token'] = str(RefreshToken.for_user(self.user))
+
+    def react(self, emoji='LIKE'):
+        return self.client.post(reverse('reaction_toggle', args=[self.post.id, emoji]))
+
+    def test_reactions_limited_per_user(self):
+        self.assertEqual(self.react().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.react().status_code, status.HTTP_200_OK)
+        response = self.react()
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        # Requête refusée : le compteur n'a pas bougé
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 0)
+
+    def test_reactions_limited_per_ip_across_users(self):
+        other = User.objects.create(username='other', email='other@example.com')
+        self.react()
+        self.react()
+        self.client.cookies['refresh_token'] = str(RefreshToken.for_user(other))
+        self.assertEqual(self.react().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.react().status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_comments_limited_per_user(self):
+        url = reverse('comment_create', args=[self.post.id])
+        self.assertEqual(self.client.post(url, {'content': 'Premier'}, format='json').status_code,
+                         status.HTTP_201_CREATED)
+        self.assertEqual(self.client.post(url, {'content': 'Second'}, format='json').status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(Comment.objects.filter(post=self.post).count(), 1)
+
+
+@override_settings(REACTION_WRITE_MODE='log')
+class ReactionEventLogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.users = [User.objects.create(username=f'reader{i}', email=f'reader{i}@example.com') for i in range(4)]
+        self.posts = [Post.objects.create(title=f'Post {i}', content='Contenu', author=self.users[0]) for i in range(3)]
+
+    def test_toggle_is_logged_with_optimistic_counts(self):
+        post = self.posts[0]
+        self.client.cookies['refresh_token'] = str(RefreshToken.for_user(self.users[1]))
+        url = reverse('reaction_toggle', args=[post.id, 'LOVE'])
+
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['my_reactions'], ['LOVE'])
+        self.assertEqual(response.data['counts']['LOVE'], 1)
+        self.assertFalse(Reaction.objects.exists())
+
+        response = self.client.post(url)
+        self.assertEqual(response.data['my_reactions'], [])
+        self.assertEqual(response.data['counts']['LOVE'], 0)
+        response = self.client.post(url)
+        self.assertEqual(response.data['my_reactions'], ['LOVE'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('aggregate_reactions', stdout=StringIO())
+        post.refresh_from_db()
+        self.assertEqual(post.love_count, 1)
+        self.assertTrue(Reaction.objects.filter(post=post, user=self.users[1], emoji='LOVE').exists())
+        self.assertFalse(ReactionEvent.objects.exists())
+
+
+@override_settings(REACTION_WRITE_MODE='log')
+class ConcurrentReactionLogTests(TransactionTestCase):
+    """Écrivains et agrégateurs dans des threads (et des connexions) distincts."""
+
+    def setUp(self):
+        cache.clear()
+        self.users = [User.objects.create(username=f'reader{i}', email=f'reader{i}@example.com') for i in range(4)]
+        self.posts = [Post.objects.create(title=f'Post {i}', content='Contenu', author=self.users[0]) for i in range(3)]
+
+    def run_threads(self, targets):
+        errors = []
+
+        def run(target):
+            try:
+                target()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+        for thread in threads:
+            thread.start()
+        return threads, errors
+
+    def test_concurrent_replay_matches_serial_result(self):
+        rng = random.Random(42)
+        emojis = ['LIKE', 'LOVE', 'WOW']
+        # État initial : quelques réactions déjà agrégées
+        for post in self.posts:
+            Reaction.objects.create(post=post, user=self.users[0], emoji='LIKE')
+        Post.objects.all().rebuild_reaction_counts()
+        toggles = [(rng.choice(self.posts), rng.choice(self.users), rng.choice(emojis)) for _ in range(300)]
+
+        # Résultat séquentiel : chaque toggle inverse l'état de sa clé
+        expected = {(post.pk, self.users[0].pk, 'LIKE') for post in self.posts}
+        for post, user, emoji in toggles:
+            expected ^= {(post.pk, user.pk, emoji)}
+
+        # SQLite en mémoire (cache partagé) refuse deux écritures simultanées (« database table
+        # is locked ») : chaque opération y prend un verrou, l'entrelacement reste celui des
+        # threads. Sous PostgreSQL, les transactions se chevauchent réellement.
+        serialize = threading.Lock() if connection.vendor == 'sqlite' else nullcontext()
+        writing = threading.Event()
+        writing.set()
+
+        def writer(part):
+            def write():
+                for post, user, emoji in part:
+                    with serialize:
+                        append_toggle(post, user, emoji)
+            return write
+
+        def aggregator(seed):
+            batch_sizes = random.Random(seed)
+
+            def aggregate():
+                while writing.is_set():
+                    with serialize:
+                        aggregate_reaction_events(batch_size=batch_sizes.randint(1, 30))
+            return aggregate
+
+        # Quatre écrivains, deux agrégateurs ; l'ordre d'arrivée est libre, seule la parité par clé compte
+        writers, writer_errors = self.run_threads([writer(toggles[i::4]) for i in range(4)])
+        aggregators, aggregator_errors = self.run_threads([aggregator(seed) for seed in (1, 2)])
+        for thread in writers:
+            thread.join()
+        writing.clear()
+        for thread in aggregators:
+            thread.join()
+        self.assertEqual(writer_errors + aggregator_errors, [])
+        while aggregate_reaction_events(batch_size=25):
+            pass
+
+        self.assertFalse(ReactionEvent.objects.exists())
+        self.assertEqual(set(Reaction.objects.values_list('post_id', 'user_id', 'emoji')), expected)
+        # Parité compteurs / lignes Reaction
+        rows = Counter(Reaction.objects.values_list('post_id', 'emoji'))
+        for post in Post.objects.all():
+            for emoji, count in post.get_reaction_counts().items():
+                self.assertEqual(count, rows[(post.pk, emoji)], f"post {post.pk}, {emoji}")
+
+
+class PerformanceMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+        self.client = APIClient()
+        self.author = User.objects.create(username='author', email='author@example.com')
+        create_posts(self.author, 3)
+
+    def test_server_timing_reports_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('post_list'))
+        timing = response['Server-Timing']
+        self.assertIn(f'desc="{len(ctx.captured_queries)} SQL"', timing)
+        self.assertIn('serialize;dur=', timing)
+        self.assertIn('total;dur=', timing)
+
+    def test_metrics_endpoint_is_admin_only(self):
+        self.client.get(reverse('post_list'))
+        url = reverse('metrics')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.cookies['refresh_token'] = str(RefreshToken.for_user(self.author))
+        self.assertIn(self.client.get(url).status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+        # Admin authentifié par cookie seulement, comme depuis le frontend
+        admin = User.objects.create(username='admin', email='admin@example.com', is_staff=True)
+        self.client.cookies['refresh_token'] = str(RefreshToken.for_user(admin))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.content.decode()
+        self.assertIn('# TYPE blog_db_queries histogram', body)
+        self.assertIn('blog_http_request_duration_seconds_count{view="post_list"} 1', body)
+        self.assertIn('blog_response_size_bytes_bucket{view="post_list",le="+Inf"} 1', body)
+
+    async def test_async_view_is_measured(self):
+        response = await self.async_client.get(reverse('async_tag_list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('SQL", serialize;dur=', response['Server-Timing'])
+        self.assertIn('async_tag_list', registry.render())
+
+    def observed(self, metric, view):
+        line = f'blog_{metric}_sum{{view="{view}"}} '
+        return next(float(row[len(line):]) for row in registry.render().splitlines() if row.startswith(line))
+
+    @override_settings(POSTS_STREAM_THRESHOLD=2)
+    def test_streamed_body_is_measured(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('about_author', args=[self.author.pk]))
+            self.assertTrue(response.streaming)
+            # Rien n'est enregistré avant la fin du flux
+            self.assertNotIn('view="about_author"', registry.render())
+            body = b''.join(response.streaming_content)
+        self.assertEqual(len(json.loads(body)['posts']), 3)
+        # Les requêtes des blocs (itérateur, prefetch) sont comptées avec celles de la vue
+        self.assertEqual(self.observed('db_queries', 'about_author'), len(ctx.captured_queries))
+        self.assertEqual(self.observed('response_size_bytes', 'about_author'), len(body))
+        self.assertGreater(self.observed('serializer_duration_seconds', 'about_author'), 0)
+
+    def test_middleware_chain_is_not_adapted_under_asgi(self):
+        adapted = []
+        adapt_method_mode = BaseHandler.adapt_method_mode
+
+        def spy(handler, is_async, method, *args, **kwargs):
+            result = adapt_method_mode(handler, is_async, method, *args, **kwargs)
+            # Les process_view synchrones sont toujours adaptés par Django : seule la chaîne compte
+            if result is not method and kwargs.get('name'):
+                adapted.append(kwargs['name'])
+            return result
+
+        with mock.patch.object(BaseHandler, 'adapt_method_mode', spy):
+            ASGIHandler().load_middleware(is_async=True)
+        self.assertEqual(adapted, [])
+
+
+class BenchmarkToolingTests(TestCase):
+    def top_decile_comment_share(self, **options):
+        """Part des commentaires portée par les 10 % de posts les plus commentés, après un seed_data."""
+        Post.objects.all().delete()
+        call_command('seed_data', users=10, posts=100, tags=5, comments_per_post=5, reactions_per_post=3,
+                     seed=7, stdout=StringIO(), **options)
+        self.assertEqual(Post.objects.count(), 100)
+        counts = sorted(Post.objects.annotate(n=Count('comments')).values_list('n', flat=True), reverse=True)
+        return sum(counts[:10]) / sum(counts)
+
+    def test_seed_data_skew_concentrates_comments(self):
+        uniform = self.top_decile_comment_share()
+        skewed = self.top_decile_comment_share(skew=1.2)
+        # Uniforme sur 0..2 × moyenne : le premier décile porte environ 20 % des commentaires
+        self.assertLess(uniform, 0.3)
+        # Pareto : même graine, le premier décile en porte au moins la moitié
+        self.assertGreater(skewed, 0.5)
+        self.assertGreater(skewed, 2 * uniform)
+
+    @override_settings(RATE_LIMITS={})
+    def test_load_test_writes_leave_existing_data_untouched(self):
+        author = User.objects.create(username='author', email='author@example.com')
+        create_posts(author, 2)
+        before = (
+            list(Post.objects.order_by('pk').values()), Comment.objects.count(),
+            Reaction.objects.count(), sorted(Tag.objects.values_list('name', flat=True)),
+        )
+
+        scenario = Scenario()
+        routes = scenario.routes()
+        client = APIClient()
+        for name in ('post_create', 'post_update', 'comment_create', 'reaction_toggle', 'post_import'):
+            request = routes[name](0)
+            client.cookies['refresh_token'] = request.refresh_token
+            response = client.generic(request.method, request.path, request.data, request.content_type)
+            self.assertLess(response.status_code, 400, name)
+        scenario.cleanup()
+
+        after = (
+            list(Post.objects.order_by('pk').values()), Comment.objects.count(),
+            Reaction.objects.count(), sorted(Tag.objects.values_list('name', flat=True)),
+        )
+        self.assertEqual(after, before)
+
+    def test_compare_flags_latency_and_query_regressions(self):
+        baseline = {'routes': {'post_list': {
+            'errors': 0, 'p50_ms': 10.0, 'p95_ms': 20.0, 'p99_ms': 30.0,
+            'throughput_rps': 100.0, 'queries_per_request': 2,
+        }}}
+        current = {'routes': {'post_list': dict(baseline['routes']['post_list'])}}
+        self.assertEqual(find_regressions(current, baseline, tolerance=0.25, min_ms=2), [])
+
+        current['routes']['post_list'].update(p95_ms=40.0, queries_per_request=12)
+        regressions = find_regressions(current, baseline, tolerance=0.25, min_ms=2)
+        self.assertEqual(len(regressions), 2)
+        self.assertIn('p95_ms', regressions[0])
+
+
+class RenderingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.author = User.objects.create(username='author', email='author@example.com')
+        create_posts(self.author, 5)
+
+    def test_fast_renderer_matches_stdlib_output(self):
+        data = PostSerializer(Post.objects.with_related(), many=True).data
+        self.assertEqual(json.loads(dumps(data)), json.loads(dumps(data, use_orjson=False)))
+        self.assertEqual(json.loads(FastJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+
+    def test_line_separators_are_escaped_like_drf(self):
+        data = {'content': 'a\u2028b\u2029c’'}
+        expected = JSONRenderer().render(data)
+        self.assertIn(b'\\u2028', expected)
+        self.assertEqual(dumps(data, use_orjson=False), expected)
+        self.assertEqual(dumps(data), expected)
+
+    def test_nan_is_rejected_by_stdlib_fallback(self):
+        with self.assertRaises(ValueError):
+            dumps({'score': float('nan')}, use_orjson=False)
+
+    def test_large_author_page_is_streamed_with_same_payload(self):
+        url = reverse('about_author', args=[self.author.pk])
+        expected = self.client.get(url).json()
+
+        cache.clear()
+        with override_settings(POSTS_STREAM_THRESHOLD=2):
+            response = self.client.get(url)
+        self.assertTrue(response.streaming)
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), expected)
+
+    def test_stream_chunks_queryset(self):
+        chunks = list(StreamingJSONRenderer(chunk_size=2).stream(Post.objects.with_related(), PostSerializer))
+        # Crochet ouvrant, trois blocs (2 + 2 + 1 posts), crochet fermant
+        self.assertEqual(len(chunks), 5)
+        self.assertEqual(len(json.loads(b''.join(chunks))), 5)
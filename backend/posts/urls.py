@@ -1,11 +1,15 @@
 from django.urls import path
 from .views import (
     PostListView, PostDetailView, PostCreateView, PostUpdateView,
-    CommentCreateView, ReactionToggleView, AboutAuthorView , TagListView
+    CommentCreateView, ReactionToggleView, AboutAuthorView , TagListView, PostSearchView,
+    PostExportView, PostImportView, CommentListView, MyReactionsView
 )
+from . import async_views
 
 urlpatterns = [
     path('', PostListView.as_view(), name='post_list'),
+
+    path('search/', PostSearchView.as_view(), name='post_search'),
    
     path('<int:pk>/', PostDetailView.as_view(), name='post_detail'),
     
@@ -14,10 +18,27 @@ urlpatterns = [
     path('<int:pk>/update/', PostUpdateView.as_view(), name='post_update'),
     
     path('<int:pk>/comment/', CommentCreateView.as_view(), name='comment_create'),
+
+    path('<int:pk>/comments/', CommentListView.as_view(), name='comment_list'),
    
     path('<int:pk>/react/<str:emoji>/', ReactionToggleView.as_view(), name='reaction_toggle'),
+
+    path('<int:pk>/reactions/mine/', MyReactionsView.as_view(), name='my_reactions'),
     
     path('author/<int:author_id>/', AboutAuthorView.as_view(), name='about_author'),
 
     path('tags/', TagListView.as_view(), name='tag_list'),
+
+    path('export/', PostExportView.as_view(), name='post_export'),
+
+    path('import/', PostImportView.as_view(), name='post_import'),
+
+    # Lecture async (ASGI)
+    path('async/', async_views.post_list, name='async_post_list'),
+
+    path('async/<int:pk>/', async_views.post_detail, name='async_post_detail'),
+
+    path('async/author/<int:author_id>/', async_views.about_author, name='async_about_author'),
+
+    path('async/tags/', async_views.tag_list, name='async_tag_list'),
 ]
\ No newline at end of file
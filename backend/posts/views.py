@@ -1,43 +1,129 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
+from django.urls import reverse
 from .models import Post, Comment, Reaction , Tag
-from .serializers import PostSerializer, CommentSerializer, ReactionSerializer , TagSerializer
+from .serializers import PostSerializer, PostListSerializer, PostSummarySerializer, PostSearchResultSerializer, PostDetailSerializer, CommentSerializer, ReactionSerializer , TagSerializer
 from users.models import User
 from .permissions import IsAuthenticatedByRefreshToken
+from .cache import cached_response
+from . import search, reactions
+from .bulk import export_posts_ndjson, import_posts_ndjson, ImportFailed
 from users.serializers import UserSerializer
+from utils.renderers import StreamingJSONRenderer, dumps
 import logging
-from django.db.models import Count
+from django.db import IntegrityError, transaction
+from django.db.models import F
 
 logger = logging.getLogger('posts')
 
-# 5 pour les commentaires
-class CommentPagination(PageNumberPagination):
+# 5 pour les commentaires, par curseur (keyset) sur (created_at, id)
+class CommentPagination(CursorPagination):
     page_size = 5
     page_size_query_param = 'page_size'
     max_page_size = 100
+    ordering = ('created_at', 'id')
+
+# Pagination par curseur (keyset) sur (published_at, id) : coût constant quelle que soit la page
+class PostCursorPagination(CursorPagination):
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    ordering = ('-published_at', '-id')
+
+class PostSearchPagination(CursorPagination):
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
+    ordering = ('-rank', '-id')
+
+def post_list_representation(request):
+    """Queryset et serializer selon `?view=summary` (représentation résumée) ou complète."""
+    if request.query_params.get('view') == 'summary':
+        return Post.objects.published().summary(), PostSummarySerializer
+    return Post.objects.published().with_related(comments=False, reactions=False).with_comment_count(), PostListSerializer
 
 class PostListView(APIView):
     permission_classes = [permissions.AllowAny] 
+    # Lecture publique et mise en cache : pas d'authentification (aucune requête sur User)
+    authentication_classes = []
 
     def get(self, request):
+        return cached_response(request, ['list'], lambda: self.build_response(request))
+
+    def build_response(self, request):
         tag_slug = request.query_params.get('tag', None)
-        posts = Post.objects.all()
+        posts, serializer_class = post_list_representation(request)
         if tag_slug:
             posts = posts.filter(tags__slug=tag_slug)
-        serializer = PostSerializer(posts, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = PostCursorPagination()
+        page = paginator.paginate_queryset(posts, request, view=self)
+        serializer = serializer_class(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+class PostSearchView(APIView):
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            return Response({'error': 'Paramètre de recherche "q" manquant'}, status=status.HTTP_400_BAD_REQUEST)
+        if not search.is_supported():
+            return Response({'error': 'Recherche indisponible'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        posts = search.search_posts(
+            Post.objects.summary().published(), text
+        )
+        paginator = PostSearchPagination()
+        page = paginator.paginate_queryset(posts, request, view=self)
+        serializer = PostSearchResultSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+def build_post_detail(request, pk):
+    """Données de PostDetailView : le post et la première page de ses commentaires."""
+    post = get_object_or_404(
+        Post.objects.published().with_related(comments=False, reactions=False).with_comment_count(), pk=pk
+    )
+    paginator = CommentPagination()
+    comments = paginator.paginate_queryset(
+        Comment.objects.filter(post=post).select_related('author'), request
+    )
+    # Les pages suivantes se lisent sur l'endpoint des commentaires
+    paginator.base_url = request.build_absolute_uri(reverse('comment_list', args=[pk]))
+    return PostDetailSerializer(post, context={
+        'comments': comments,
+        'comments_next': paginator.get_next_link(),
+    }).data
 
 class PostDetailView(APIView):
     permission_classes = [permissions.AllowAny]  
+    authentication_classes = []
 
     def get(self, request, pk):
-        post = get_object_or_404(Post, pk=pk, published_at__lte=timezone.now())
-        serializer = PostSerializer(post)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return cached_response(request, [f'post:{pk}'], lambda: self.build_response(request, pk))
+
+    def build_response(self, request, pk):
+        return Response(build_post_detail(request, pk), status=status.HTTP_200_OK)
+
+class CommentListView(APIView):
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def get(self, request, pk):
+        return cached_response(request, [f'post:{pk}'], lambda: self.build_response(request, pk))
+
+    def build_response(self, request, pk):
+        get_object_or_404(Post.objects.published().only('pk'), pk=pk)
+        paginator = CommentPagination()
+        comments = paginator.paginate_queryset(
+            Comment.objects.filter(post_id=pk).select_related('author'), request, view=self
+        )
+        serializer = CommentSerializer(comments, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 class PostCreateView(APIView):
     permission_classes = [IsAuthenticatedByRefreshToken, permissions.IsAdminUser]
@@ -56,7 +142,8 @@ class PostUpdateView(APIView):
     permission_classes = [IsAuthenticatedByRefreshToken, permissions.IsAdminUser]
 
     def put(self, request, pk):
-        post = get_object_or_404(Post, pk=pk)
+        # La réponse sérialise commentaires, réactions et tags : chargés d'avance
+        post = get_object_or_404(Post.objects.with_related(), pk=pk)
         if post.author != request.user and not request.user.is_superuser:
             return Response({'error': 'Vous n’êtes pas autorisé à modifier ce post.'}, status=status.HTTP_403_FORBIDDEN)
         serializer = PostSerializer(post, data=request.data, partial=True)
@@ -69,8 +156,10 @@ class PostUpdateView(APIView):
 
 class CommentCreateView(APIView):
     permission_classes = [IsAuthenticatedByRefreshToken]  
+    rate_limit_scope = 'comments'
+
     def post(self, request, pk):
-        post = get_object_or_404(Post, pk=pk, published_at__lte=timezone.now())
+        post = get_object_or_404(Post.objects.published(), pk=pk)
         serializer = CommentSerializer(data=request.data)
         if serializer.is_valid():
             serializer.save(author=request.user, post=post)
@@ -83,31 +172,71 @@ class CommentCreateView(APIView):
 
 class ReactionToggleView(APIView):
     permission_classes = [IsAuthenticatedByRefreshToken]  
+    rate_limit_scope = 'reactions'
 
     def post(self, request, pk, emoji):
-        post = get_object_or_404(Post, pk=pk, published_at__lte=timezone.now())
+        post = get_object_or_404(Post.objects.published(), pk=pk)
 
         if emoji not in dict(Reaction.EMOJI_CHOICES).keys():
             return Response({'error': 'Emoji invalide'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        reaction = Reaction.objects.filter(post=post, user=request.user, emoji=emoji).first()
-        if reaction:
-            reaction.delete()
-        else:
-            Reaction.objects.create(post=post, user=request.user, emoji=emoji)
-
-        
-        serializer = PostSerializer(post, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+
+        if reactions.write_mode() == 'log':
+            # Le toggle est journalisé ; Reaction et les compteurs suivront à l'agrégation
+            counts, mine = reactions.append_toggle(post, request.user, emoji)
+            return Response({'counts': counts, 'my_reactions': mine}, status=status.HTTP_202_ACCEPTED)
+
+        counter = Post.reaction_count_field(emoji)
+        with transaction.atomic():
+            # Le DELETE est atomique : un seul des toggles concurrents voit deleted == 1
+            deleted, _ = Reaction.objects.filter(post=post, user=request.user, emoji=emoji).delete()
+            if deleted:
+                Post.objects.filter(pk=post.pk, **{f'{counter}__gt': 0}).update(**{counter: F(counter) - 1})
+            else:
+                try:
+                    with transaction.atomic():
+                        Reaction.objects.create(post=post, user=request.user, emoji=emoji)
+                except IntegrityError:
+                    # Une requête concurrente a déjà créé la réaction et incrémenté le compteur
+                    pass
+                else:
+                    Post.objects.filter(pk=post.pk).update(**{counter: F(counter) + 1})
+
+        # ?full=1 : ancienne réponse complète (contenu, commentaires, réactions)
+        if request.query_params.get('full') in ('1', 'true'):
+            post = Post.objects.with_related().get(pk=post.pk)
+            serializer = PostSerializer(post, context={'request': request})
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        counts, mine = reactions.reaction_state(post.pk, request.user)
+        return Response({'counts': counts, 'my_reactions': mine}, status=status.HTTP_200_OK)
+
+class MyReactionsView(APIView):
+    """Compteurs et réactions de l'utilisateur connecté sur un post (hors cache public du détail)."""
+    permission_classes = [IsAuthenticatedByRefreshToken]
+
+    def get(self, request, pk):
+        get_object_or_404(Post.objects.published().only('pk'), pk=pk)
+        counts, mine = reactions.reaction_state(pk, request.user)
+        return Response({'counts': counts, 'my_reactions': mine}, status=status.HTTP_200_OK)
 
 class AboutAuthorView(APIView):
     permission_classes = [permissions.AllowAny]  
+    authentication_classes = []
 
     def get(self, request, author_id):
+        return cached_response(request, [f'author:{author_id}'], lambda: self.build_response(request, author_id))
+
+    def build_response(self, request, author_id):
         author = get_object_or_404(User, pk=author_id)
-        posts = Post.objects.filter(author=author, published_at__lte=timezone.now())
+        posts, serializer_class = post_list_representation(request)
+        posts = posts.filter(author=author)
         author_data = UserSerializer(author).data
-        posts_data = PostSerializer(posts, many=True).data
+        if posts.count() > getattr(settings, 'POSTS_STREAM_THRESHOLD', 200):
+            # Trop gros pour le cache et pour la mémoire : même JSON, envoyé en flux bloc par bloc
+            return StreamingJSONRenderer().response(
+                posts, serializer_class,
+                prefix=b'{"author":' + dumps(author_data) + b',"posts":[', suffix=b']}',
+            )
+        posts_data = serializer_class(posts, many=True).data
         return Response({
             'author': author_data,
             'posts': posts_data
@@ -115,8 +244,37 @@ class AboutAuthorView(APIView):
 
 class TagListView(APIView):
     permission_classes = [permissions.AllowAny]
+    authentication_classes = []
 
     def get(self, request):
+        return cached_response(request, ['tags'], lambda: self.build_response(request))
+
+    def build_response(self, request):
         tags = Tag.objects.all()
         serializer = TagSerializer(tags, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+class PostExportView(APIView):
+    permission_classes = [IsAuthenticatedByRefreshToken, permissions.IsAdminUser]
+
+    def get(self, request):
+        logger.info(f"Export NDJSON des posts par {request.user.username}")
+        return StreamingHttpResponse(export_posts_ndjson(), content_type='application/x-ndjson')
+
+class PostImportView(APIView):
+    permission_classes = [IsAuthenticatedByRefreshToken, permissions.IsAdminUser]
+
+    def post(self, request):
+        # Lecture ligne à ligne du corps brut (sans passer par request.data) pour ne pas tout charger
+        try:
+            stats = import_posts_ndjson(request._request)
+        except ImportFailed as e:
+            # Les lots précédant la ligne en erreur sont déjà en base : on le dit au client
+            logger.warning(f"Échec de l'import NDJSON : {e} (déjà importé : {e.stats})")
+            return Response({
+                'error': f'NDJSON invalide : {e}',
+                'line': e.line,
+                'imported': e.stats,
+            }, status=status.HTTP_400_BAD_REQUEST)
+        logger.info(f"Import NDJSON par {request.user.username}: {stats}")
+        return Response(stats, status=status.HTTP_201_CREATED)
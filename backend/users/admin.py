@@ -1,5 +1,11 @@
 from django.contrib import admin
-from .models import User, PasswordResetToken
+from .models import User, PasswordResetToken, OutgoingEmail
 
 admin.site.register(User)
-admin.site.register(PasswordResetToken)
\ No newline at end of file
+admin.site.register(PasswordResetToken)
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    ordering = ('-created_at',)
\ No newline at end of file
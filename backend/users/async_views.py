@@ -0,0 +1,58 @@
+# users/async_views.py
+# Connexion async (ASGI) : le hachage du mot de passe tourne dans le pool borné de
+# users.hashers au lieu de bloquer la boucle d'événements.
+import json
+import math
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from utils.ratelimit import check_rate_limit
+from .models import User
+from .serializers import UserSerializer, LoginSerializer
+from .tokens import issue_refresh_token
+import logging
+
+logger = logging.getLogger('users')
+
+
+@csrf_exempt
+@require_POST
+async def login(request):
+    # Même seau que LoginView : la limite vaut pour les deux chemins
+    wait = await sync_to_async(check_rate_limit)(request, 'login')
+    if wait is not None:
+        response = JsonResponse({'detail': 'Trop de requêtes'}, status=429)
+        response['Retry-After'] = str(math.ceil(wait))
+        return response
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'error': 'JSON invalide'}, status=400)
+    serializer = LoginSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+
+    username = serializer.validated_data['username']
+    user = await User.objects.filter(username=username).afirst()
+    if user is None:
+        logger.warning(f"Échec de connexion: utilisateur {username} non trouvé")
+        return JsonResponse({'error': 'Utilisateur non trouvé'}, status=401)
+    if not await user.acheck_password(serializer.validated_data['password']):
+        logger.warning(f"Échec de connexion pour {username}: mot de passe incorrect")
+        return JsonResponse({'error': 'Mot de passe incorrect'}, status=401)
+
+    refresh = await sync_to_async(issue_refresh_token)(user)
+    response = JsonResponse({
+        'user': UserSerializer(user).data,
+        'access': str(refresh.access_token),
+    })
+    response.set_cookie(
+        key='refresh_token',
+        value=str(refresh),
+        httponly=True,
+        secure=False,
+        samesite='Lax',
+        max_age=7*24*60*60
+    )
+    return response
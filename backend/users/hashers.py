@@ -0,0 +1,36 @@
+# users/hashers.py
+# Hashers de mots de passe réglables depuis les settings (voir PASSWORD_HASHER), et pool
+# de threads borné pour hacher hors de la boucle d'événements sur le chemin async.
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher, PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    iterations = getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', PBKDF2PasswordHasher.iterations)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id (nécessite argon2-cffi). Un changement de paramètres déclenche un re-hachage à la connexion."""
+    time_cost = getattr(settings, 'PASSWORD_ARGON2_TIME_COST', 2)
+    memory_cost = getattr(settings, 'PASSWORD_ARGON2_MEMORY_COST', 19 * 1024)
+    parallelism = getattr(settings, 'PASSWORD_ARGON2_PARALLELISM', 1)
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    work_factor = getattr(settings, 'PASSWORD_SCRYPT_WORK_FACTOR', 2 ** 14)
+    block_size = getattr(settings, 'PASSWORD_SCRYPT_BLOCK_SIZE', 8)
+    parallelism = getattr(settings, 'PASSWORD_SCRYPT_PARALLELISM', 1)
+
+
+# Au plus PASSWORD_HASH_WORKERS hachages simultanés : une vague de connexions
+# ne peut pas monopoliser tous les cœurs au détriment des autres requêtes
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'PASSWORD_HASH_WORKERS', 4),
+    thread_name_prefix='password-hash',
+)
+
+
+async def run_in_hash_pool(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
@@ -0,0 +1,62 @@
+import asyncio
+import time
+from django.core.mail import EmailMessage
+from django.core.mail.backends.smtp import EmailBackend as SMTPBackend
+from django.core.management.base import BaseCommand, CommandError
+from utils.custom_email_backend import CustomEmailBackend, get_pool
+
+
+class SinkHandler:
+    async def handle_DATA(self, server, session, envelope):
+        return '250 OK'
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare le débit (messages/s) du backend SMTP de Django (une connexion par envoi) "
+        "et de CustomEmailBackend (connexions poolées) contre un serveur aiosmtpd local."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=500)
+        parser.add_argument('--port', type=int, default=8025)
+        parser.add_argument('--latency', type=float, default=0.0,
+                            help="Délai simulé (s) à l'ouverture de chaque connexion, ex. poignée de main TLS.")
+
+    def handle(self, *args, **options):
+        try:
+            from aiosmtpd.controller import Controller
+        except ImportError:
+            raise CommandError("aiosmtpd est requis : pip install aiosmtpd")
+
+        latency = options['latency']
+
+        class SlowHandshakeHandler(SinkHandler):
+            async def handle_EHLO(self, server, session, envelope, hostname, responses):
+                if latency:
+                    await asyncio.sleep(latency)
+                session.host_name = hostname
+                return responses
+
+        controller = Controller(SlowHandshakeHandler(), hostname='127.0.0.1', port=options['port'])
+        controller.start()
+        try:
+            params = {'host': '127.0.0.1', 'port': options['port'], 'username': '', 'password': '',
+                      'use_tls': False, 'use_ssl': False}
+            results = {}
+            for name, backend_class in (('django_smtp', SMTPBackend), ('pooled', CustomEmailBackend)):
+                results[name] = self.run(backend_class, params, options['messages'])
+                self.stdout.write(f"{name}: {results[name]:.1f} messages/s")
+            get_pool(('127.0.0.1', options['port'], '', False, False)).clear()
+        finally:
+            controller.stop()
+        self.stdout.write(self.style.SUCCESS(f"Gain : x{results['pooled'] / results['django_smtp']:.2f}"))
+
+    def run(self, backend_class, params, count):
+        start = time.perf_counter()
+        for i in range(count):
+            # Comme send_mail() : un backend (donc une connexion, sans pool) par message
+            backend = backend_class(**params)
+            EmailMessage(f'Bench {i}', 'Corps', 'bench@example.com', ['to@example.com'],
+                         connection=backend).send()
+        return count / (time.perf_counter() - start)
@@ -0,0 +1,47 @@
+import time
+from django.core.management.base import BaseCommand
+from users.hashers import TunedPBKDF2PasswordHasher, TunedArgon2PasswordHasher, TunedScryptPasswordHasher
+
+HASHERS = {
+    'pbkdf2': TunedPBKDF2PasswordHasher,
+    'argon2': TunedArgon2PasswordHasher,
+    'scrypt': TunedScryptPasswordHasher,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure le débit (hachages/s sur un cœur) de chaque hasher configurable, "
+        "avec les paramètres des settings (PASSWORD_PBKDF2_*, PASSWORD_ARGON2_*, PASSWORD_SCRYPT_*)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hashes', type=int, default=20, help="Hachages par hasher.")
+        parser.add_argument('--hasher', choices=sorted(HASHERS), action='append',
+                            help="Hasher à mesurer (répétable). Par défaut : tous.")
+
+    def handle(self, *args, **options):
+        for name in options['hasher'] or HASHERS:
+            hasher = HASHERS[name]()
+            try:
+                hasher.encode('échauffement', hasher.salt())
+            except ValueError as e:
+                # Bibliothèque manquante (ex: argon2-cffi)
+                self.stdout.write(self.style.WARNING(f"{name}: ignoré ({e})"))
+                continue
+            count = options['hashes']
+            start = time.perf_counter()
+            for i in range(count):
+                hasher.encode(f'mot de passe {i}', hasher.salt())
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{name} {self.describe(hasher)}: {count / elapsed:.1f} hachages/s/cœur, "
+                f"{elapsed / count * 1000:.1f} ms par hachage"
+            )
+
+    def describe(self, hasher):
+        if isinstance(hasher, TunedArgon2PasswordHasher):
+            return f"(t={hasher.time_cost}, m={hasher.memory_cost} Kio, p={hasher.parallelism})"
+        if isinstance(hasher, TunedScryptPasswordHasher):
+            return f"(N={hasher.work_factor}, r={hasher.block_size}, p={hasher.parallelism})"
+        return f"({hasher.iterations} itérations)"
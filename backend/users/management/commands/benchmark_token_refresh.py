@@ -0,0 +1,52 @@
+import secrets
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from users.models import User
+from users.tokens import issue_refresh_token
+from users.views import RefreshTokenView
+
+MODES = ('blacklist', 'family')
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare le débit de RefreshTokenView en rotation 'blacklist' (tables simplejwt) "
+        "et 'family' (état dans le cache), sur la base et le cache configurés."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--refreshes', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        user = User.objects.create(username=f'bench{secrets.token_hex(4)}', email='bench@example.com')
+        try:
+            results = {}
+            for mode in MODES:
+                with override_settings(REFRESH_TOKEN_ROTATION=mode):
+                    results[mode] = self.run(user, options['refreshes'])
+                rate, queries = results[mode]
+                self.stdout.write(f"{mode}: {rate:.1f} rotations/s, {queries:.1f} requêtes SQL par rotation")
+        finally:
+            OutstandingToken.objects.filter(user=user).delete()
+            user.delete()
+        self.stdout.write(self.style.SUCCESS(f"Gain : x{results['family'][0] / results['blacklist'][0]:.2f}"))
+
+    def run(self, user, count):
+        factory = APIRequestFactory()
+        view = RefreshTokenView.as_view()
+        refresh_token = str(issue_refresh_token(user))
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            for _ in range(count):
+                request = factory.post('/api/token/refresh/')
+                request.COOKIES['refresh_token'] = refresh_token
+                response = view(request)
+                if response.status_code != 200:
+                    raise RuntimeError(f"Rotation refusée : {response.data}")
+                refresh_token = response.cookies['refresh_token'].value
+            elapsed = time.perf_counter() - start
+        return count / elapsed, len(queries) / count
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from users.models import PasswordResetToken
+from users.utils import purge_in_batches
+
+
+class Command(BaseCommand):
+    help = (
+        "Supprime par lots les tokens de réinitialisation expirés et les refresh tokens JWT expirés "
+        "(OutstandingToken, et leurs BlacklistedToken en cascade)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help="Pause entre deux lots, en secondes, pour étaler la charge.")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        batch = {'batch_size': options['batch_size'], 'pause': options['pause']}
+        reset_tokens = purge_in_batches(PasswordResetToken.objects.filter(expires_at__lt=now), **batch)
+        # Un token expiré n'a plus besoin d'être blacklisté : il est refusé de toute façon
+        jwt_tokens = purge_in_batches(OutstandingToken.objects.filter(expires_at__lt=now), **batch)
+        self.stdout.write(self.style.SUCCESS(
+            f"{reset_tokens} token(s) de réinitialisation et {jwt_tokens} refresh token(s) expirés supprimés."
+        ))
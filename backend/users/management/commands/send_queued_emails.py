@@ -0,0 +1,23 @@
+import time
+from django.core.management.base import BaseCommand
+from users.utils import send_queued_emails
+
+
+class Command(BaseCommand):
+    help = "Envoie les emails de l'outbox par lots, sur une connexion SMTP par lot, avec reprise sur échec."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--loop', action='store_true', help="Tourne en continu.")
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help="Attente entre deux lots quand la file est vide, en secondes.")
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_queued_emails(batch_size=options['batch_size'])
+            if sent or failed:
+                self.stdout.write(f"{sent} email(s) envoyé(s), {failed} échec(s).")
+            if not options['loop']:
+                return
+            if not (sent or failed):
+                time.sleep(options['interval'])
@@ -0,0 +1,38 @@
+# Index de la purge des tokens expirés (purge_expired_tokens) sur la table de simplejwt.
+# Le modèle OutstandingToken appartient à une app tierce : l'index n'est pas déclaré dans
+# son Meta, il est créé ici avec le schema editor (SQL propre à chaque base) et seulement
+# s'il n'existe pas déjà.
+
+from django.db import migrations, models
+
+INDEX_NAME = 'outstandingtoken_expires_at_idx'
+
+
+def _index_exists(schema_editor, model):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        return INDEX_NAME in connection.introspection.get_constraints(cursor, model._meta.db_table)
+
+
+def add_index(apps, schema_editor):
+    OutstandingToken = apps.get_model('token_blacklist', 'OutstandingToken')
+    if not _index_exists(schema_editor, OutstandingToken):
+        schema_editor.add_index(OutstandingToken, models.Index(fields=['expires_at'], name=INDEX_NAME))
+
+
+def remove_index(apps, schema_editor):
+    OutstandingToken = apps.get_model('token_blacklist', 'OutstandingToken')
+    if _index_exists(schema_editor, OutstandingToken):
+        schema_editor.remove_index(OutstandingToken, models.Index(fields=['expires_at'], name=INDEX_NAME))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_token_expires_at_indexes'),
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_index, remove_index),
+    ]
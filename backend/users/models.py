@@ -1,5 +1,5 @@
 from django.db import models
-from django.contrib.auth.hashers import make_password, check_password
+from django.contrib.auth.hashers import make_password, check_password, verify_password
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.utils import timezone  
 from datetime import timedelta  
@@ -18,12 +18,25 @@ class User(AbstractBaseUser, PermissionsMixin):
     REQUIRED_FIELDS = ['email']  
 
     def set_password(self, raw_password):
-        """Hache le mot de passe avec PBKDF2."""
+        """Hache le mot de passe avec le hasher préféré (settings.PASSWORD_HASHER)."""
         self.password = make_password(raw_password)
 
     def check_password(self, raw_password):
-        """Vérifie le mot de passe haché."""
-        return check_password(raw_password, self.password)
+        """Vérifie le mot de passe haché ; le re-hache si le hasher ou ses paramètres ont changé."""
+        return check_password(raw_password, self.password, self._rehash)
+
+    async def acheck_password(self, raw_password):
+        """Comme check_password, mais le hachage tourne dans le pool borné de users.hashers."""
+        from .hashers import run_in_hash_pool
+        is_correct, must_update = await run_in_hash_pool(verify_password, raw_password, self.password)
+        if is_correct and must_update:
+            await run_in_hash_pool(self.set_password, raw_password)
+            await self.asave(update_fields=['password'])
+        return is_correct
+
+    def _rehash(self, raw_password):
+        self.set_password(raw_password)
+        self.save(update_fields=['password'])
 
     def __str__(self):
         return self.username
@@ -36,7 +49,8 @@ class PasswordResetToken(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     token = models.CharField(max_length=100, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    expires_at = models.DateTimeField()
+    # Indexé pour la purge des tokens expirés (purge_expired_tokens)
+    expires_at = models.DateTimeField(db_index=True)
 
     def save(self, *args, **kwargs):
         if not self.token:
@@ -46,4 +60,42 @@ class PasswordResetToken(models.Model):
         super().save(*args, **kwargs)
 
     def is_valid(self):
-        return timezone.now() <= self.expires_at
\ No newline at end of file
+        return timezone.now() <= self.expires_at
+
+class OutgoingEmail(models.Model):
+    """File d'attente des emails (outbox), envoyés par la commande send_queued_emails."""
+    STATUS_PENDING = 'PENDING'
+    STATUS_SENT = 'SENT'
+    STATUS_FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'En attente'),
+        (STATUS_SENT, 'Envoyé'),
+        (STATUS_FAILED, 'Échec définitif'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    to = models.TextField(help_text="Destinataires séparés par des virgules")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def recipients(self):
+        return [address for address in self.to.split(',') if address]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to} ({self.status})"
+
+    class Meta:
+        verbose_name = "Email en attente"
+        verbose_name_plural = "Emails en attente"
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at'], condition=models.Q(status='PENDING'),
+                name='outgoingemail_pending_idx',
+            ),
+        ]
@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from utils.metrics import TimedSerializerMixin
 from .models import User
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'is_staff']
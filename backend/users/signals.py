@@ -0,0 +1,14 @@
+# users/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import User
+from .utils import invalidate_cached_user
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    user_id = instance.pk
+    invalidate_cached_user(user_id)
+    # Et après le commit, pour ne pas garder une version relue avant la fin de la transaction
+    transaction.on_commit(lambda: invalidate_cached_user(user_id))
@@ -0,0 +1,119 @@
+# users/tests/test_budgets.py
+# Budgets de performance des endpoints d'authentification (voir posts/tests/test_budgets.py) :
+# requêtes SQL identiques avec peu ou beaucoup d'utilisateurs et de tokens, réponse sous budget.
+import logging
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from users.models import User, PasswordResetToken
+from users.tokens import issue_refresh_token
+
+logging.disable(logging.CRITICAL)
+
+# Utilisateurs en base, et tokens (refresh, réinitialisation) par utilisateur, y compris `member`
+SMALL = {'users': 2, 'tokens': 1}
+LARGE = {'users': 40, 'tokens': 6}
+
+# Budgets (en octets), environ 25 % au-dessus de la taille mesurée
+BUDGETS = {
+    'register': 400,
+    'login': 400,
+    'async_login': 420,
+    'token_refresh': 300,
+    'logout': 50,
+    'password_reset_request': 60,
+    'password_reset_confirm': 60,
+}
+
+PASSWORD = 'TestPassword123'
+
+
+# Hachage rapide : on mesure les requêtes, pas le coût du hachage
+@override_settings(RATE_LIMITS={}, PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class AuthEndpointBudgetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.member = User(username='member', email='member@example.com')
+        self.member.set_password(PASSWORD)
+        self.member.save()
+        self.users = [self.member]
+        self.calls = 0
+
+    def grow(self, users, tokens):
+        """Ajoute des utilisateurs, puis des tokens à chacun jusqu'à l'échelle donnée."""
+        while len(self.users) < users:
+            n = len(self.users)
+            self.users.append(User.objects.create(username=f'user{n}', email=f'user{n}@example.com'))
+        for user in self.users:
+            for _ in range(tokens - PasswordResetToken.objects.filter(user=user).count()):
+                issue_refresh_token(user)
+                PasswordResetToken.objects.create(user=user)
+
+    def measure(self, send):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            response = send()
+        return response.status_code, len(ctx.captured_queries), len(response.content)
+
+    def assertWithinBudget(self, endpoint, send, expected_status=200):
+        self.grow(**SMALL)
+        small_status, small_queries, _ = self.measure(send)
+        self.grow(**LARGE)
+        large_status, large_queries, size = self.measure(send)
+
+        self.assertEqual((small_status, large_status), (expected_status, expected_status))
+        self.assertEqual(
+            small_queries, large_queries,
+            f"{endpoint} : {small_queries} requêtes SQL à petite échelle, {large_queries} à grande échelle",
+        )
+        self.assertLessEqual(size, BUDGETS[endpoint], f"{endpoint} : {size} octets (budget {BUDGETS[endpoint]})")
+
+    def with_refresh_token(self, url):
+        # Rotation et déconnexion consomment le token : un token neuf par appel
+        def send():
+            self.client.cookies['refresh_token'] = str(issue_refresh_token(self.member))
+            return self.client.post(url)
+        return send
+
+    def test_register(self):
+        def send():
+            self.calls += 1
+            return self.client.post(reverse('register'), {
+                'username': f'new{self.calls}', 'email': f'new{self.calls}@example.com', 'password': PASSWORD,
+            }, format='json')
+        self.assertWithinBudget('register', send, expected_status=201)
+
+    def test_login(self):
+        credentials = {'username': 'member', 'password': PASSWORD}
+        self.assertWithinBudget('login', lambda: self.client.post(reverse('login'), credentials, format='json'))
+
+    def test_async_login(self):
+        credentials = {'username': 'member', 'password': PASSWORD}
+        self.assertWithinBudget('async_login', lambda: self.client.post(reverse('async_login'), credentials, format='json'))
+
+    def test_token_refresh(self):
+        self.assertWithinBudget('token_refresh', self.with_refresh_token(reverse('token_refresh')))
+
+    @override_settings(REFRESH_TOKEN_ROTATION='family')
+    def test_token_refresh_family_rotation(self):
+        self.assertWithinBudget('token_refresh', self.with_refresh_token(reverse('token_refresh')))
+
+    def test_logout(self):
+        self.assertWithinBudget('logout', self.with_refresh_token(reverse('logout')), expected_status=205)
+
+    def test_password_reset_request(self):
+        self.assertWithinBudget('password_reset_request', lambda: self.client.post(
+            reverse('password_reset_request'), {'email': 'member@example.com'}, format='json',
+        ))
+
+    def test_password_reset_confirm(self):
+        def send():
+            token = PasswordResetToken.objects.create(user=self.member)
+            return self.client.post(
+                reverse('password_reset_confirm', args=[token.token]), {'password': PASSWORD}, format='json',
+            )
+        self.assertWithinBudget('password_reset_confirm', send)
@@ -0,0 +1,194 @@
+# users/tests/test_outbox.py
+from unittest import mock
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from io import StringIO
+from rest_framework.test import APIClient
+from rest_framework import status
+from users.models import User, OutgoingEmail, PasswordResetToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
+from datetime import timedelta
+from users.utils import send_queued_emails, claim_queued_emails, EMAIL_MAX_ATTEMPTS
+from utils.custom_email_backend import CustomEmailBackend, get_pool
+import logging
+import smtplib
+
+# Désactiver les logs pendant les tests pour éviter le bruit
+logging.disable(logging.CRITICAL)
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User(username='testuser', email='testuser@example.com')
+        self.user.set_password('TestPassword123')
+        self.user.save()
+
+    def test_reset_request_queues_email(self):
+        response = self.client.post(reverse('password_reset_request'), {'email': 'testuser@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(mail.outbox), 0)
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.recipients(), ['testuser@example.com'])
+        self.assertEqual(email.status, OutgoingEmail.STATUS_PENDING)
+
+    def test_worker_sends_batch(self):
+        for i in range(3):
+            self.client.post(reverse('password_reset_request'), {'email': 'testuser@example.com'}, format='json')
+        call_command('send_queued_emails', stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(OutgoingEmail.objects.exclude(status=OutgoingEmail.STATUS_SENT).exists())
+
+    def test_failure_is_retried_with_backoff(self):
+        email = OutgoingEmail.objects.create(subject='S', body='B', from_email='a@example.com', to='b@example.com')
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=OSError('SMTP down')):
+            self.assertEqual(send_queued_emails(), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutgoingEmail.STATUS_PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        # Pas encore dû : rien n'est repris
+        self.assertEqual(send_queued_emails(), (0, 0))
+
+    def test_gives_up_after_max_attempts(self):
+        email = OutgoingEmail.objects.create(subject='S', body='B', from_email='a@example.com', to='b@example.com',
+                                             attempts=EMAIL_MAX_ATTEMPTS - 1)
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=OSError('SMTP down')):
+            send_queued_emails()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutgoingEmail.STATUS_FAILED)
+
+    def test_batch_is_claimed_before_sending(self):
+        for i in range(2):
+            OutgoingEmail.objects.create(subject='S', body='B', from_email='a@example.com', to=f'b{i}@example.com')
+        during_send = []
+
+        def send(message):
+            # Pendant l'envoi, un autre worker ne trouve rien à réserver
+            during_send.append(claim_queued_emails())
+            return 1
+
+        with mock.patch('django.core.mail.EmailMessage.send', autospec=True, side_effect=send):
+            self.assertEqual(send_queued_emails(), (2, 0))
+        self.assertEqual(during_send, [[], []])
+        self.assertEqual(OutgoingEmail.objects.filter(status=OutgoingEmail.STATUS_SENT).count(), 2)
+
+    def test_result_is_recorded_per_email(self):
+        for i in range(2):
+            OutgoingEmail.objects.create(subject='S', body='B', from_email='a@example.com', to=f'b{i}@example.com')
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=[1, KeyboardInterrupt]):
+            with self.assertRaises(KeyboardInterrupt):
+                send_queued_emails()
+        # Le premier envoi est enregistré ; le second reste réservé et sera repris après le bail
+        first, second = OutgoingEmail.objects.order_by('pk')
+        self.assertEqual(first.status, OutgoingEmail.STATUS_SENT)
+        self.assertEqual(second.status, OutgoingEmail.STATUS_PENDING)
+        self.assertGreater(second.next_attempt_at, timezone.now())
+
+
+class FakeSMTP:
+    instances = 0
+
+    def __init__(self, *args, **kwargs):
+        FakeSMTP.instances += 1
+        self.sent = 0
+
+    def sendmail(self, from_email, recipients, message):
+        self.sent += 1
+
+    def noop(self):
+        return (250, b'OK')
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FailingSMTP(FakeSMTP):
+    """Connexion coupée par le serveur au `fail_on`-ième envoi (tous objets confondus)."""
+    fail_on = 2
+    calls = 0
+
+    def sendmail(self, from_email, recipients, message):
+        FailingSMTP.calls += 1
+        if FailingSMTP.calls == self.fail_on:
+            raise smtplib.SMTPServerDisconnected('Connexion fermée')
+        super().sendmail(from_email, recipients, message)
+
+
+class PooledEmailBackendTests(TestCase):
+    def setUp(self):
+        FakeSMTP.instances = 0
+        patcher = mock.patch('smtplib.SMTP', FakeSMTP)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.params = {'host': 'pool.test', 'port': 2525, 'username': '', 'password': '',
+                       'use_tls': False, 'use_ssl': False}
+
+    def tearDown(self):
+        get_pool(('pool.test', 2525, '', False, False)).clear()
+
+    def send(self, count):
+        for i in range(count):
+            backend = CustomEmailBackend(**self.params)
+            EmailMessage('S', 'B', 'a@example.com', ['b@example.com'], connection=backend).send()
+
+    def test_connection_is_reused(self):
+        self.send(10)
+        self.assertEqual(FakeSMTP.instances, 1)
+
+    def test_connection_is_recycled_after_max_messages(self):
+        backend = CustomEmailBackend(**self.params)
+        self.addCleanup(setattr, backend.pool, 'max_messages', backend.pool.max_messages)
+        backend.pool.max_messages = 3
+        self.assertEqual(backend.send_bulk('S', 'B', 'a@example.com', [f'u{i}@example.com' for i in range(7)]), 7)
+        self.assertEqual(FakeSMTP.instances, 3)
+
+    def test_failure_mid_batch_reopens_connection(self):
+        FailingSMTP.calls = 0
+        backend = CustomEmailBackend(fail_silently=True, **self.params)
+        with mock.patch('smtplib.SMTP', FailingSMTP):
+            sent = backend.send_bulk('S', 'B', 'a@example.com', [f'u{i}@example.com' for i in range(4)])
+        # Le deuxième message échoue, les suivants partent sur une nouvelle connexion
+        self.assertEqual(sent, 3)
+        self.assertEqual(FakeSMTP.instances, 2)
+
+
+class PurgeExpiredTokensTests(TestCase):
+    def test_purges_only_expired_tokens(self):
+        user = User.objects.create(username='testuser', email='testuser@example.com')
+        expired = timezone.now() - timedelta(hours=1)
+        for i in range(5):
+            PasswordResetToken.objects.create(user=user, expires_at=expired)
+        live = PasswordResetToken.objects.create(user=user)
+        old_refresh = RefreshToken.for_user(user)
+        OutstandingToken.objects.filter(jti=old_refresh['jti']).update(expires_at=expired)
+        old_refresh.blacklist()
+        RefreshToken.for_user(user)
+
+        out = StringIO()
+        call_command('purge_expired_tokens', batch_size=2, stdout=out)
+        self.assertIn('5 token(s)', out.getvalue())
+        self.assertEqual(list(PasswordResetToken.objects.all()), [live])
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+
+class OutstandingTokenIndexMigrationTests(TransactionTestCase):
+    def index_names(self):
+        with connection.cursor() as cursor:
+            return set(connection.introspection.get_constraints(cursor, OutstandingToken._meta.db_table))
+
+    def test_index_migration_is_reversible(self):
+        self.assertIn('outstandingtoken_expires_at_idx', self.index_names())
+        call_command('migrate', 'users', '0003', verbosity=0)
+        self.assertNotIn('outstandingtoken_expires_at_idx', self.index_names())
+        call_command('migrate', 'users', verbosity=0)
+        self.assertIn('outstandingtoken_expires_at_idx', self.index_names())
@@ -1,5 +1,8 @@
 # users/tests/test_views.py
-from django.test import TestCase
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.urls import reverse
@@ -8,6 +11,9 @@ from datetime import timedelta
 from users.models import User, PasswordResetToken
 from users.serializers import UserSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from users.tokens import FamilyRefreshToken, issue_refresh_token
+from users.utils import get_cached_user
 import logging
 
 # Désactiver les logs pendant les tests pour éviter le bruit
@@ -206,4 +212,116 @@ class PasswordResetConfirmViewTests(TestCase):
         data = {'password': 'NewPassword123'}
         response = self.client.post(self.password_reset_confirm_url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('error', response.data)
\ No newline at end of file
+        self.assertIn('error', response.data)
+
+@override_settings(REFRESH_TOKEN_ROTATION='family')
+class FamilyRotationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.refresh_url = reverse('token_refresh')
+        self.user = User.objects.create(username='testuser', email='testuser@example.com')
+        self.refresh_token = str(issue_refresh_token(self.user))
+
+    def refresh(self, token):
+        self.client.cookies['refresh_token'] = token
+        return self.client.post(self.refresh_url, format='json')
+
+    def test_rotation_does_not_write_to_database(self):
+        get_cached_user(self.user.pk)
+        with self.assertNumQueries(0):
+            response = self.refresh(self.refresh_token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+        self.assertFalse(OutstandingToken.objects.exists())
+
+    def test_reuse_revokes_the_whole_family(self):
+        new_token = self.refresh(self.refresh_token).cookies['refresh_token'].value
+        response = self.refresh(self.refresh_token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        # Le token légitime issu de la rotation est révoqué avec sa famille
+        response = self.refresh(new_token)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_revokes_family(self):
+        self.client.cookies['refresh_token'] = self.refresh_token
+        response = self.client.post(reverse('logout'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_205_RESET_CONTENT)
+        self.assertEqual(self.refresh(self.refresh_token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_with_rotated_token_revokes_family(self):
+        new_token = self.refresh(self.refresh_token).cookies['refresh_token'].value
+        # Ancien cookie, déjà tourné : la déconnexion réussit et révoque le token courant
+        self.client.cookies['refresh_token'] = self.refresh_token
+        response = self.client.post(reverse('logout'), format='json')
+        self.assertEqual(response.status_code, status.HTTP_205_RESET_CONTENT)
+        self.assertEqual(self.refresh(new_token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_blacklist_mode_token_is_migrated(self):
+        response = self.refresh(str(RefreshToken.for_user(self.user)))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('fam', FamilyRefreshToken(response.cookies['refresh_token'].value))
+
+    def test_inactive_user_cannot_refresh(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.refresh(self.refresh_token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+SCRYPT_FIRST = ['users.hashers.TunedScryptPasswordHasher', 'users.hashers.TunedPBKDF2PasswordHasher']
+
+
+class PasswordHashingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User(username='testuser', email='testuser@example.com')
+        self.user.set_password('TestPassword123')
+        self.user.save()
+        self.credentials = {'username': 'testuser', 'password': 'TestPassword123'}
+
+    @override_settings(PASSWORD_HASHERS=SCRYPT_FIRST)
+    def test_login_rehashes_with_preferred_hasher(self):
+        response = self.client.post(reverse('login'), self.credentials, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('scrypt$'))
+        self.assertTrue(self.user.check_password('TestPassword123'))
+
+    @override_settings(PASSWORD_HASHERS=SCRYPT_FIRST)
+    def test_async_login_rehashes_with_preferred_hasher(self):
+        response = self.client.post(reverse('async_login'), self.credentials, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.json())
+        self.assertIn('refresh_token', response.cookies)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('scrypt$'))
+
+    @override_settings(PASSWORD_HASHERS=SCRYPT_FIRST)
+    def test_rehash_does_not_invalidate_author_caches(self):
+        with mock.patch('posts.signals.bump_on_commit') as bump:
+            response = self.client.post(reverse('login'), self.credentials, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        bump.assert_not_called()
+        # Un changement visible de l'auteur invalide toujours ses pages
+        with mock.patch('posts.signals.bump_on_commit') as bump:
+            self.user.username = 'renamed'
+            self.user.save(update_fields=['username'])
+        bump.assert_called_once()
+
+    def test_login_with_legacy_django_hasher(self):
+        # Hash produit par un hasher par défaut de Django absent de _PASSWORD_HASHER_CLASSES
+        User.objects.filter(pk=self.user.pk).update(
+            password=make_password('TestPassword123', hasher='pbkdf2_sha1')
+        )
+        response = self.client.post(reverse('login'), self.credentials, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
+
+    def test_async_login_wrong_password(self):
+        response = self.client.post(
+            reverse('async_login'), {'username': 'testuser', 'password': 'WrongPassword'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
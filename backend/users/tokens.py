@@ -0,0 +1,120 @@
+# users/tokens.py
+# Émission, rotation et révocation des refresh tokens, selon settings.REFRESH_TOKEN_ROTATION :
+# - 'blacklist' : tables token_blacklist de simplejwt (une écriture en base par rotation) ;
+# - 'family' : chaque token porte un identifiant de famille (claim `fam`) ; la réutilisation
+#   d'un token déjà tourné révoque toute la famille. L'état vit dans le cache (Redis), avec
+#   une expiration égale à la durée de vie des tokens : aucune table ne grossit.
+#   Cet état n'a pas d'autre copie : si le cache l'évince (politique allkeys-*, mémoire
+#   pleine) ou est vidé, la détection de réutilisation et les déconnexions de ces familles
+#   sont perdues sans erreur. En production, Redis doit utiliser noeviction ou volatile-*
+#   (les clés de ce module ont toutes une expiration) et ne pas être partagé avec un cache
+#   qui se remplit jusqu'à maxmemory.
+import uuid
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken, Token
+from .utils import get_cached_user
+import logging
+
+logger = logging.getLogger('users')
+
+FAMILY_CLAIM = 'fam'
+
+
+class FamilyRefreshToken(Token):
+    """Refresh token sans BlacklistMixin : ni OutstandingToken à l'émission, ni requête à la vérification."""
+    token_type = 'refresh'
+    lifetime = api_settings.REFRESH_TOKEN_LIFETIME
+    no_copy_claims = RefreshToken.no_copy_claims + (FAMILY_CLAIM,)
+    access_token_class = AccessToken
+    access_token = RefreshToken.access_token
+
+
+def rotation_mode():
+    return getattr(settings, 'REFRESH_TOKEN_ROTATION', 'blacklist')
+
+
+def _used_key(jti):
+    return f'users:refresh:used:{jti}'
+
+
+def _revoked_key(family):
+    return f'users:refresh:revoked:{family}'
+
+
+def _remaining_lifetime(token):
+    """Secondes avant l'expiration du token : au-delà, il est refusé de toute façon."""
+    exp = datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc)
+    return max(int((exp - token.current_time).total_seconds()), 1)
+
+
+def _family_lifetime():
+    return int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
+
+def issue_refresh_token(user, family=None):
+    if rotation_mode() != 'family':
+        return RefreshToken.for_user(user)
+    token = FamilyRefreshToken.for_user(user)
+    token[FAMILY_CLAIM] = family or uuid.uuid4().hex
+    return token
+
+
+def _decode(raw_token):
+    """Vérifie signature et expiration. Les tokens émis en mode 'blacklist' restent acceptés."""
+    if rotation_mode() == 'family':
+        token = FamilyRefreshToken(raw_token)
+        if FAMILY_CLAIM in token:
+            return token
+    return RefreshToken(raw_token)
+
+
+def verify_refresh_token(raw_token):
+    """Vérifie un refresh token (signature, expiration, révocation) et le retourne."""
+    token = _decode(raw_token)
+    if FAMILY_CLAIM in token:
+        # Famille révoquée, ou token déjà tourné
+        if cache.get_many([_revoked_key(token[FAMILY_CLAIM]), _used_key(token['jti'])]):
+            raise TokenError("Token révoqué")
+    return token
+
+
+def rotate_refresh_token(raw_token):
+    """
+    Consomme un refresh token et retourne (access token, nouveau refresh token).
+    Lève TokenError si le token est invalide, expiré, révoqué ou réutilisé.
+    """
+    token = _decode(raw_token)
+    user = get_cached_user(token['user_id'])
+    if not user.is_active:
+        raise TokenError("Utilisateur désactivé")
+
+    if FAMILY_CLAIM not in token:
+        token.blacklist()
+        return token.access_token, issue_refresh_token(user)
+
+    family = token[FAMILY_CLAIM]
+    if cache.get(_revoked_key(family)):
+        raise TokenError("Token révoqué")
+    # SET NX atomique : une seule rotation peut consommer un jti donné
+    if not cache.add(_used_key(token['jti']), 1, _remaining_lifetime(token)):
+        cache.set(_revoked_key(family), 1, _family_lifetime())
+        logger.warning(f"Réutilisation d'un refresh token : famille {family} révoquée (utilisateur {user.pk})")
+        raise TokenError("Token déjà utilisé")
+    return token.access_token, issue_refresh_token(user, family=family)
+
+
+def revoke_refresh_token(raw_token):
+    """
+    Déconnexion : blackliste le token, ou révoque toute sa famille. Un token de famille
+    déjà tourné (onglet resté sur un ancien cookie) ou déjà révoqué suffit : seuls la
+    signature et l'expiration sont vérifiées, la révocation est idempotente.
+    """
+    token = _decode(raw_token)
+    if FAMILY_CLAIM in token:
+        cache.set(_revoked_key(token[FAMILY_CLAIM]), 1, _family_lifetime())
+    else:
+        token.blacklist()
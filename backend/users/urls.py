@@ -1,10 +1,13 @@
 from django.urls import path
 from .views import RegisterView, LoginView,RefreshTokenView ,LogoutView, PasswordResetRequestView, PasswordResetConfirmView
 from rest_framework_simplejwt.views import TokenRefreshView
+from . import async_views
 
 urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
     path('login/', LoginView.as_view(), name='login'),
+    # Connexion async (ASGI) : hachage dans un pool de threads borné
+    path('async/login/', async_views.login, name='async_login'),
     path('token/refresh/', RefreshTokenView.as_view(), name='token_refresh'),
     path('logout/', LogoutView.as_view(), name='logout'),
     path('password/reset/', PasswordResetRequestView.as_view(), name='password_reset_request'),
@@ -1,9 +1,150 @@
 import secrets
-from django.core.mail import send_mail
+import logging
+import time
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
-from .models import User, PasswordResetToken
+from .models import User, PasswordResetToken, OutgoingEmail
+
+logger = logging.getLogger('users')
+
+# Outbox : nombre d'essais et délais de reprise (backoff exponentiel), en secondes
+EMAIL_MAX_ATTEMPTS = getattr(settings, 'EMAIL_MAX_ATTEMPTS', 5)
+EMAIL_RETRY_BASE_DELAY = getattr(settings, 'EMAIL_RETRY_BASE_DELAY', 30)
+EMAIL_RETRY_MAX_DELAY = getattr(settings, 'EMAIL_RETRY_MAX_DELAY', 60 * 60)
+# Bail d'un lot réservé par un worker : s'il meurt pendant l'envoi, le lot redevient dû après ce délai
+EMAIL_SEND_LEASE = getattr(settings, 'EMAIL_SEND_LEASE', 10 * 60)
+
+# Durée maximale pendant laquelle un utilisateur désactivé hors signaux (ex: queryset.update) reste accepté
+USER_CACHE_TIMEOUT = getattr(settings, 'USER_CACHE_TIMEOUT', 60)
+
+
+def _user_cache_key(user_id):
+    return f'users:user:{user_id}'
+
+
+def get_cached_user(user_id):
+    """Retourne l'utilisateur depuis le cache, ou depuis la base (lève User.DoesNotExist)."""
+    key = _user_cache_key(user_id)
+    user = cache.get(key)
+    if user is None:
+        user = User.objects.get(id=user_id)
+        cache.set(key, user, USER_CACHE_TIMEOUT)
+    return user
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(_user_cache_key(user_id))
+
+
+def purge_in_batches(queryset, batch_size=1000, pause=0.0):
+    """
+    Supprime les lignes du queryset par lots de `batch_size` (une courte transaction
+    par lot, sans verrou long sur la table). Retourne le nombre de lignes du modèle supprimées.
+    """
+    model = queryset.model
+    deleted = 0
+    while True:
+        pks = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return deleted
+        with transaction.atomic():
+            _, per_model = model.objects.filter(pk__in=pks).delete()
+        deleted += per_model.get(model._meta.label, 0)
+        if pause:
+            time.sleep(pause)
+
+
+def queue_mail(subject, message, from_email, recipient_list):
+    """Ajoute un email à l'outbox ; il sera envoyé par la commande send_queued_emails."""
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email,
+        to=','.join(recipient_list),
+    )
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(EMAIL_RETRY_BASE_DELAY * 2 ** (attempts - 1), EMAIL_RETRY_MAX_DELAY))
+
+
+def _record_failure(email, error):
+    email.attempts += 1
+    email.last_error = str(error)
+    if email.attempts >= EMAIL_MAX_ATTEMPTS:
+        email.status = OutgoingEmail.STATUS_FAILED
+        logger.error(f"Email {email.pk} abandonné après {email.attempts} essais: {error}")
+    else:
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+
+
+def claim_queued_emails(batch_size=100):
+    """
+    Réserve un lot d'emails dus dans une courte transaction : leur prochaine tentative est
+    repoussée de EMAIL_SEND_LEASE, les autres workers ne les reprennent donc pas pendant l'envoi.
+    """
+    with transaction.atomic():
+        # skip_locked : plusieurs workers peuvent se partager la file
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutgoingEmail.STATUS_PENDING, next_attempt_at__lte=timezone.now())
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        if emails:
+            lease = timezone.now() + timedelta(seconds=EMAIL_SEND_LEASE)
+            OutgoingEmail.objects.filter(pk__in=[email.pk for email in emails]).update(next_attempt_at=lease)
+    return emails
+
+
+def _save_result(email):
+    email.save(update_fields=['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'])
+
+
+def send_queued_emails(batch_size=100):
+    """
+    Envoie un lot d'emails en attente sur une seule connexion SMTP. Le lot est réservé
+    puis envoyé hors transaction (aucun verrou tenu pendant le SMTP) ; le résultat est
+    enregistré email par email. Un échec reprogramme l'email avec un backoff exponentiel,
+    puis le marque FAILED après EMAIL_MAX_ATTEMPTS essais. Retourne (envoyés, échecs).
+    """
+    sent = failed = 0
+    emails = claim_queued_emails(batch_size)
+    if not emails:
+        return sent, failed
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        logger.warning(f"Connexion SMTP impossible: {e}")
+        for email in emails:
+            _record_failure(email, e)
+            _save_result(email)
+        return sent, len(emails)
+
+    try:
+        for email in emails:
+            message = EmailMessage(email.subject, email.body, email.from_email,
+                                   email.recipients(), connection=connection)
+            try:
+                message.send()
+            except Exception as e:
+                failed += 1
+                _record_failure(email, e)
+            else:
+                sent += 1
+                email.attempts += 1
+                email.status = OutgoingEmail.STATUS_SENT
+                email.sent_at = timezone.now()
+                email.last_error = ''
+            _save_result(email)
+    finally:
+        connection.close()
+    return sent, failed
 
 
 def send_reset_email(user, token):
@@ -19,10 +160,9 @@ def send_reset_email(user, token):
 
     Si vous n'avez pas fait cette demande, ignorez cet email.
     """
-    send_mail(
+    queue_mail(
         subject,
         message,
         settings.EMAIL_HOST_USER,
         [user.email],
-        fail_silently=False,
-    )
\ No newline at end of file
+    )
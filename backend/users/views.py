@@ -1,26 +1,24 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from rest_framework_simplejwt.tokens import RefreshToken
-from django_ratelimit.decorators import ratelimit
-from django.utils.decorators import method_decorator
 from rest_framework.permissions import AllowAny
 from .models import User, PasswordResetToken
 from .serializers import UserSerializer, RegisterSerializer, LoginSerializer, PasswordResetRequestSerializer, PasswordResetConfirmSerializer
 from .utils import send_reset_email
+from .tokens import issue_refresh_token, rotate_refresh_token, revoke_refresh_token
 import logging
 
 logger = logging.getLogger('users')
 
 class RegisterView(APIView):
     permission_classes = [AllowAny]
+    rate_limit_scope = 'register'
 
-    @method_decorator(ratelimit(key='ip', rate='5/m', method='POST'))
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
-            refresh = RefreshToken.for_user(user)
+            refresh = issue_refresh_token(user)
             response = Response({
                 'user': UserSerializer(user).data,
                 'access': str(refresh.access_token),
@@ -38,8 +36,8 @@ class RegisterView(APIView):
 
 class LoginView(APIView):
     permission_classes = [AllowAny]
+    rate_limit_scope = 'login'
 
-    @method_decorator(ratelimit(key='ip', rate='5/m', method='POST'))
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
@@ -48,7 +46,7 @@ class LoginView(APIView):
             try:
                 user = User.objects.get(username=username)
                 if user.check_password(password):
-                    refresh = RefreshToken.for_user(user)
+                    refresh = issue_refresh_token(user)
                     response = Response({
                         'user': UserSerializer(user).data,
                         'access': str(refresh.access_token),
@@ -75,7 +73,6 @@ class RefreshTokenView(APIView):
 
     def post(self, request):
         refresh_token = request.COOKIES.get('refresh_token')
-        logger.info(f"Refresh token reçu : {refresh_token}")
         if not refresh_token:
             logger.warning("Tentative de rafraîchissement sans refresh token")
             return Response(
@@ -83,19 +80,9 @@ class RefreshTokenView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         try:
-            token = RefreshToken(refresh_token)
-            logger.info(f"Token payload : {token.payload}")
-            access_token = str(token.access_token)
-            logger.info("Access token généré avec succès")
-            token.blacklist()
-            logger.info("Token blacklisté avec succès")
-            user_id = token.payload.get('user_id')
-            logger.info(f"User ID extrait : {user_id}")
-            user = User.objects.get(id=user_id)
-            new_refresh = RefreshToken.for_user(user)
-            logger.info("Nouveau refresh token généré")
+            access_token, new_refresh = rotate_refresh_token(refresh_token)
             response = Response(
-                {'access': access_token},
+                {'access': str(access_token)},
                 status=status.HTTP_200_OK
             )
             response.set_cookie(
@@ -126,8 +113,7 @@ class LogoutView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         try:
-            token = RefreshToken(refresh_token)
-            token.blacklist()
+            revoke_refresh_token(refresh_token)
             response = Response({'message': 'Déconnexion réussie'}, status=status.HTTP_205_RESET_CONTENT)
             response.delete_cookie('refresh_token')
             return response
@@ -137,8 +123,8 @@ class LogoutView(APIView):
 
 class PasswordResetRequestView(APIView):
     permission_classes = [AllowAny]
+    rate_limit_scope = 'password_reset'
 
-    @method_decorator(ratelimit(key='ip', rate='100/h', method='POST'))
     def post(self, request):
         serializer = PasswordResetRequestSerializer(data=request.data)
         if serializer.is_valid():
@@ -1,8 +1,141 @@
+import smtplib
+import threading
+import time
+from django.core.mail import EmailMessage
 from django.core.mail.backends.smtp import EmailBackend as SMTPBackend
 from django.conf import settings
 
+# Pool de connexions SMTP partagé par le processus : évite une poignée de main TCP/TLS
+# et un login par envoi. Une connexion est recyclée après POOL_MAX_MESSAGES messages
+# ou POOL_IDLE_TIMEOUT secondes d'inactivité, et vérifiée (NOOP) avant réutilisation.
+POOL_SIZE = getattr(settings, 'EMAIL_POOL_SIZE', 4)
+POOL_IDLE_TIMEOUT = getattr(settings, 'EMAIL_POOL_IDLE_TIMEOUT', 60)
+POOL_MAX_MESSAGES = getattr(settings, 'EMAIL_POOL_MAX_MESSAGES', 100)
+# En dessous de ce délai d'inactivité, la connexion est réutilisée sans NOOP
+POOL_HEALTHCHECK_AFTER = 1.0
+
+
+class SMTPConnectionPool:
+    def __init__(self, max_size=POOL_SIZE, idle_timeout=POOL_IDLE_TIMEOUT, max_messages=POOL_MAX_MESSAGES):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_messages = max_messages
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Retourne une connexion inactive saine, ou None s'il faut en ouvrir une."""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                connection = self._idle.pop()
+            idle_for = time.monotonic() - connection._pool_last_used
+            if idle_for > self.idle_timeout or connection._pool_sent >= self.max_messages:
+                discard(connection)
+            elif idle_for < POOL_HEALTHCHECK_AFTER or is_healthy(connection):
+                return connection
+            else:
+                discard(connection)
+
+    def release(self, connection):
+        if connection._pool_sent < self.max_messages:
+            connection._pool_last_used = time.monotonic()
+            with self._lock:
+                if len(self._idle) < self.max_size:
+                    self._idle.append(connection)
+                    return
+        discard(connection)
+
+    def clear(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            discard(connection)
+
+
+def is_healthy(connection):
+    try:
+        return connection.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+
+def discard(connection):
+    try:
+        connection.quit()
+    except (smtplib.SMTPException, OSError):
+        connection.close()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key):
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = SMTPConnectionPool()
+        return _pools[key]
+
+
 class CustomEmailBackend(SMTPBackend):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = get_pool((self.host, self.port, self.username, self.use_tls, self.use_ssl))
+        self._broken = False
+
     def open(self):
+        if self.connection:
+            return False
+        connection = self.pool.acquire()
+        if connection is not None:
+            self.connection = connection
+            self._broken = False
+            return True
         if hasattr(settings, 'EMAIL_SSL_CONTEXT'):
             self.ssl_context = settings.EMAIL_SSL_CONTEXT
-        return super().open()
\ No newline at end of file
+        opened = super().open()
+        if opened:
+            self.connection._pool_sent = 0
+            self.connection._pool_last_used = time.monotonic()
+            self._broken = False
+        return opened
+
+    def close(self):
+        """Rend la connexion au pool au lieu de la fermer (sauf si elle est en erreur)."""
+        if self.connection is not None and not self._broken and self._partial_connection is None:
+            connection, self.connection = self.connection, None
+            self.pool.release(connection)
+        super().close()
+
+    def _send(self, email_message):
+        # Connexion en erreur ou plafond de messages atteint en cours de lot : on en change
+        if self.connection is None or self._broken or self.connection._pool_sent >= self.pool.max_messages:
+            if self.connection is not None:
+                discard(self.connection)
+                self.connection = None
+            if not self.open():
+                return False
+        # fail_silently est appliqué ici : le parent avalerait l'erreur sans qu'on puisse
+        # marquer la connexion comme cassée pour les messages suivants du lot
+        fail_silently, self.fail_silently = self.fail_silently, False
+        try:
+            sent = super()._send(email_message)
+        except (smtplib.SMTPException, OSError):
+            self._broken = True
+            if not fail_silently:
+                raise
+            return False
+        finally:
+            self.fail_silently = fail_silently
+        if sent:
+            self.connection._pool_sent += 1
+        return sent
+
+    def send_bulk(self, subject, body, from_email, recipient_list):
+        """Un message par destinataire, envoyés sur la même connexion. Retourne le nombre envoyé."""
+        return self.send_messages([
+            EmailMessage(subject, body, from_email, [recipient], connection=self)
+            for recipient in recipient_list
+        ])
@@ -0,0 +1,193 @@
+# utils/log.py
+# Journalisation non bloquante : les handlers ne font que déposer l'enregistrement dans
+# une file bornée ; un thread écrit les lignes JSON par lots, avec rotation par taille.
+# Filtres d'échantillonnage et de limitation de débit pour les logs des chemins chauds.
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+# Attributs standard d'un LogRecord : tout le reste vient de `extra` et part dans le JSON
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class QueuedFileHandler(logging.handlers.QueueHandler):
+    """
+    Handler de fichier asynchrone : emit() ne fait qu'un put_nowait dans une file bornée.
+    Quand la file est pleine, l'enregistrement est abandonné (et compté) plutôt que
+    d'attendre le disque. Une erreur d'écriture (disque plein, rotation impossible...)
+    passe par handleError() sans arrêter le thread : les lots suivants sont retentés. Le thread d'écriture démarre au premier log de chaque processus
+    (compatible avec les workers forkés) et vide la file à l'arrêt.
+    """
+
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, backup_count=5, queue_size=10000, batch_size=256):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.target = logging.handlers.RotatingFileHandler(
+            filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True
+        )
+        self.batch_size = batch_size
+        self.dropped = 0
+        # dropped est incrémenté par les threads appelants et remis à zéro par le thread d'écriture
+        self._dropped_lock = threading.Lock()
+        self._pid = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def prepare(self, record):
+        # Le minimum dans le thread appelant : le formatage JSON se fait dans le thread d'écriture
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self._pid != os.getpid():
+            self._start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def _start(self):
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # Processus forké : la file et le thread du parent ne sont pas utilisables ici
+                self.queue = queue.Queue(maxsize=self.queue.maxsize)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+            self._thread.start()
+            atexit.register(self.flush_queue)
+
+    def _run(self):
+        while True:
+            records = [self.queue.get()]
+            while len(records) < self.batch_size:
+                try:
+                    records.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in records
+            self._write([record for record in records if record is not None])
+            for _ in records:
+                self.queue.task_done()
+            if stop:
+                return
+
+    def _write(self, records):
+        if not records:
+            return
+        formatter = self.formatter or JsonFormatter()
+        lines = []
+        for record in records:
+            try:
+                lines.append(formatter.format(record))
+            except Exception:
+                self.target.handleError(record)
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            lines.append(json.dumps({'level': 'WARNING', 'logger': 'utils.log',
+                                     'message': f'{dropped} log(s) abandonné(s) : file pleine'}))
+        target = self.target
+        try:
+            with target.lock:
+                if target.stream is None:
+                    target.stream = target._open()
+                # Une seule écriture (et un seul flush) par lot
+                target.stream.write('\n'.join(lines) + '\n')
+                target.stream.flush()
+                if target.maxBytes and target.stream.tell() >= target.maxBytes:
+                    target.doRollover()
+        except Exception:
+            # Le lot est perdu, mais le thread doit survivre pour les suivants
+            self.target.handleError(records[-1])
+
+    def flush_queue(self, timeout=5.0):
+        """Attend l'écriture des enregistrements en file (au plus `timeout` secondes)."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        deadline = time.monotonic() + timeout
+        while self.queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def close(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            try:
+                self.queue.put(None, timeout=1.0)
+                self._thread.join(timeout=5.0)
+            except queue.Full:
+                pass
+        self.target.close()
+        super().close()
+
+
+class SamplingFilter(logging.Filter):
+    """Ne garde qu'une fraction `rate` des enregistrements sous `max_level` ; les autres passent tous."""
+
+    def __init__(self, rate=0.1, max_level='WARNING'):
+        super().__init__()
+        self.rate = rate
+        self.max_level = logging.getLevelName(max_level)
+
+    def filter(self, record):
+        return record.levelno >= self.max_level or random.random() < self.rate
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Au plus `per_second` enregistrements par seconde et par ligne de code appelante
+    (les messages sont des f-strings : le site d'appel est la seule clé stable), pour
+    les niveaux sous `max_level`. Le nombre de messages supprimés est ajouté au suivant.
+    """
+
+    def __init__(self, per_second=10, max_level='WARNING'):
+        super().__init__()
+        self.per_second = per_second
+        self.max_level = logging.getLevelName(max_level)
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= self.max_level:
+            return True
+        key = (record.pathname, record.lineno)
+        second = int(record.created)
+        with self._lock:
+            window, count, suppressed = self._windows.get(key, (second, 0, 0))
+            if window != second:
+                window, count = second, 0
+            if count >= self.per_second:
+                self._windows[key] = (window, count, suppressed + 1)
+                return False
+            self._windows[key] = (window, count + 1, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
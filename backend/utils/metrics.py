@@ -0,0 +1,162 @@
+# utils/metrics.py
+# Mesures par requête (requêtes SQL, temps base, temps de sérialisation, taille de la
+# réponse) et histogrammes par vue, exposés au format texte Prometheus. Les
+# histogrammes vivent dans le processus : chaque worker expose les siens.
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from rest_framework import permissions
+from rest_framework.views import APIView
+from posts.permissions import IsAuthenticatedByRefreshToken
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('queries', 'db_time', 'serialize_time', '_serialize_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self._serialize_depth = 0
+
+
+def start_request():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def resume_request(metrics):
+    """Réactive les mesures d'une requête (itération d'une réponse en flux). Retourne le token."""
+    return _current.set(metrics)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    """execute_wrapper installé sur chaque connexion : compte et chronomètre les requêtes."""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - start
+
+
+def instrument_connection(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(instrument_connection)
+
+
+class TimedSerializerMixin:
+    """
+    Ajoute le temps de to_representation au temps de sérialisation de la requête,
+    hors requêtes SQL déclenchées pendant la sérialisation (comptées dans le temps base).
+    Les sérialiseurs imbriqués ne sont pas comptés deux fois.
+    """
+
+    def to_representation(self, instance):
+        metrics = _current.get()
+        if metrics is None or metrics._serialize_depth:
+            return super().to_representation(instance)
+        metrics._serialize_depth += 1
+        start, db_start = time.perf_counter(), metrics.db_time
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics._serialize_depth -= 1
+            metrics.serialize_time += (time.perf_counter() - start) - (metrics.db_time - db_start)
+
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+HISTOGRAMS = {
+    'http_request_duration_seconds': ("Durée totale de la requête.", DURATION_BUCKETS),
+    'db_queries': ("Nombre de requêtes SQL par requête HTTP.", QUERY_BUCKETS),
+    'db_duration_seconds': ("Temps passé en base par requête HTTP.", DURATION_BUCKETS),
+    'serializer_duration_seconds': ("Temps de sérialisation (hors base) par requête HTTP.", DURATION_BUCKETS),
+    'response_size_bytes': ("Taille du corps de la réponse.", SIZE_BUCKETS),
+}
+
+
+class Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, view, values):
+        """values : {nom d'histogramme: valeur} pour une requête sur `view`."""
+        with self._lock:
+            for name, value in values.items():
+                buckets = HISTOGRAMS[name][1]
+                histogram = self._series.get((name, view))
+                if histogram is None:
+                    histogram = self._series[(name, view)] = Histogram(buckets)
+                index = bisect_left(buckets, value)
+                if index < len(buckets):
+                    histogram.counts[index] += 1
+                histogram.sum += value
+                histogram.count += 1
+
+    def render(self):
+        """Format texte d'exposition Prometheus (compteurs de buckets cumulés)."""
+        with self._lock:
+            series = {key: (list(h.counts), h.sum, h.count) for key, h in self._series.items()}
+        lines = []
+        for name, (help_text, buckets) in HISTOGRAMS.items():
+            metric = f'blog_{name}'
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} histogram')
+            for (series_name, view), (counts, total, count) in sorted(series.items()):
+                if series_name != name:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f'{metric}_bucket{{view="{view}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{view="{view}",le="+Inf"}} {count}')
+                lines.append(f'{metric}_sum{{view="{view}"}} {total}')
+                lines.append(f'{metric}_count{{view="{view}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+registry = Registry()
+
+
+class MetricsView(APIView):
+    """
+    Histogrammes par vue, au format Prometheus. Comme les autres endpoints d'administration,
+    réservé à un administrateur authentifié par le cookie refresh_token : le scraper doit
+    envoyer ce cookie (Cookie: refresh_token=...).
+    """
+    permission_classes = [IsAuthenticatedByRefreshToken, permissions.IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,139 @@
+# utils/middleware.py
+import logging
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connections
+from . import metrics
+
+logger = logging.getLogger('perf')
+
+
+class PerformanceMiddleware:
+    """
+    Mesure chaque requête (requêtes SQL, temps base, temps de sérialisation, taille),
+    ajoute un en-tête Server-Timing, écrit une ligne de log structurée sur le logger `perf`
+    et alimente les histogrammes par vue de utils.metrics. Synchrone et asynchrone : sous
+    ASGI, les vues async ne repassent pas par async_to_sync.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request_metrics, token, start = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self.finish(request, response, request_metrics, start)
+
+    async def __acall__(self, request):
+        request_metrics, token, start = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self.finish(request, response, request_metrics, start)
+
+    def start(self):
+        # Connexions ouvertes avant le chargement du middleware (les suivantes passent par connection_created)
+        for connection in connections.all(initialized_only=True):
+            metrics.instrument_connection(connection)
+        request_metrics, token = metrics.start_request()
+        return request_metrics, token, time.perf_counter()
+
+    def finish(self, request, response, request_metrics, start):
+        match = request.resolver_match
+        view = view_label(match) if match else 'unmatched'
+        # Pour une réponse en flux, l'en-tête part avant le corps : il ne couvre que la vue
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={request_metrics.db_time * 1000:.1f};desc="{request_metrics.queries} SQL"',
+            f'serialize;dur={request_metrics.serialize_time * 1000:.1f}',
+            f'total;dur={(time.perf_counter() - start) * 1000:.1f}',
+        ])
+        if not response.streaming:
+            self.record(request, response, view, request_metrics, start, len(response.content))
+        elif response.is_async:
+            response.streaming_content = self.ameasure_stream(
+                response.streaming_content, request, response, view, request_metrics, start
+            )
+        else:
+            response.streaming_content = self.measure_stream(
+                response.streaming_content, request, response, view, request_metrics, start
+            )
+        return response
+
+    def measure_stream(self, content, request, response, view, request_metrics, start):
+        """
+        Le corps d'une réponse en flux (requêtes SQL et sérialisation par bloc) est produit
+        après le retour du middleware : chaque bloc est calculé dans le contexte de mesure
+        de la requête, enregistrée quand le flux est épuisé ou fermé.
+        """
+        size = 0
+        iterator = iter(content)
+        try:
+            while True:
+                token = metrics.resume_request(request_metrics)
+                try:
+                    chunk = next(iterator, None)
+                finally:
+                    metrics.end_request(token)
+                if chunk is None:
+                    return
+                size += len(chunk)
+                yield chunk
+        finally:
+            self.record(request, response, view, request_metrics, start, size)
+
+    async def ameasure_stream(self, content, request, response, view, request_metrics, start):
+        size = 0
+        iterator = aiter(content)
+        try:
+            while True:
+                token = metrics.resume_request(request_metrics)
+                try:
+                    chunk = await anext(iterator, None)
+                finally:
+                    metrics.end_request(token)
+                if chunk is None:
+                    return
+                size += len(chunk)
+                yield chunk
+        finally:
+            self.record(request, response, view, request_metrics, start, size)
+
+    def record(self, request, response, view, request_metrics, start, size):
+        duration = time.perf_counter() - start
+        metrics.registry.observe(view, {
+            'http_request_duration_seconds': duration,
+            'db_queries': request_metrics.queries,
+            'db_duration_seconds': request_metrics.db_time,
+            'serializer_duration_seconds': request_metrics.serialize_time,
+            'response_size_bytes': size,
+        })
+        logger.info('request', extra={
+            'method': request.method,
+            'path': request.path,
+            'view': view,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+            'db_queries': request_metrics.queries,
+            'db_ms': round(request_metrics.db_time * 1000, 2),
+            'serialize_ms': round(request_metrics.serialize_time * 1000, 2),
+            'response_bytes': size,
+            'streaming': response.streaming,
+        })
+
+
+def view_label(match):
+    """Nom de la route, sinon chemin du module de la vue (vues sans name=)."""
+    if match.view_name:
+        return match.view_name
+    func = getattr(match.func, 'view_class', match.func)
+    return f'{func.__module__}.{func.__qualname__}'
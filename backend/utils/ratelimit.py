@@ -0,0 +1,143 @@
+# utils/ratelimit.py
+# Limitation de débit distribuée (token bucket) : un script Lua vérifie et consomme
+# les seaux par utilisateur et par IP en un seul aller-retour Redis. Sans Redis
+# (développement, tests), les seaux vivent dans le cache Django configuré.
+import logging
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger('ratelimit')
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+# KEYS : un seau par clé ; ARGV : capacité et période (ms) de chaque seau.
+# La requête n'est acceptée (et les seaux débités) que si tous les seaux ont un jeton.
+# Retourne {accepté, attente en ms}.
+TOKEN_BUCKET_LUA = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local allowed, wait, levels = 1, 0, {}
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local period = tonumber(ARGV[2 * i])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + (now - ts) * capacity / period)
+    if tokens < 1 then
+        allowed = 0
+        wait = math.max(wait, math.ceil((1 - tokens) * period / capacity))
+    end
+    levels[i] = tokens
+end
+if allowed == 1 then
+    for i, key in ipairs(KEYS) do
+        redis.call('HSET', key, 'tokens', tostring(levels[i] - 1), 'ts', now)
+        redis.call('PEXPIRE', key, ARGV[2 * i])
+    end
+end
+return {allowed, wait}
+"""
+
+
+def parse_rate(rate):
+    """'30/m' -> (30, 60) ; '100/2h' -> (100, 7200)."""
+    count, period = rate.split('/')
+    multiplier = int(period[:-1]) if len(period) > 1 else 1
+    return int(count), multiplier * PERIODS[period[-1]]
+
+
+class CacheBuckets:
+    """
+    Même algorithme que TOKEN_BUCKET_LUA sur le cache Django (développement, tests) :
+    atomique dans un processus seulement.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def consume(self, buckets):
+        now = time.time() * 1000
+        with self._lock:
+            state = cache.get_many([key for key, _, _ in buckets])
+            wait, levels = 0, {}
+            for key, capacity, period in buckets:
+                tokens, ts = state.get(key, (capacity, now))
+                tokens = min(capacity, tokens + (now - ts) * capacity / period)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) * period / capacity)
+                levels[key] = (tokens - 1, now)
+            if wait:
+                return False, wait
+            period = max(period for _, _, period in buckets)
+            cache.set_many(levels, period / 1000)
+            return True, 0
+
+
+cache_buckets = CacheBuckets()
+_script = None
+
+
+def _redis_consume(buckets):
+    """Retourne (accepté, attente en ms), ou None si le cache n'est pas Redis."""
+    global _script
+    try:
+        from django_redis import get_redis_connection
+        client = get_redis_connection('default')
+    except (ImportError, NotImplementedError):
+        return None
+    if _script is None:
+        # register_script envoie EVALSHA, et le script lui-même seulement s'il n'est pas en cache
+        _script = client.register_script(TOKEN_BUCKET_LUA)
+    args = []
+    for _, capacity, period in buckets:
+        args += [capacity, period]
+    allowed, wait = _script(keys=[key for key, _, _ in buckets], args=args, client=client)
+    return bool(allowed), wait
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def check_rate_limit(request, scope, user=None):
+    """
+    Débite les seaux de `scope` (settings.RATE_LIMITS[scope] : {'user': '30/m', 'ip': '60/m'}).
+    Retourne None si la requête est acceptée, sinon l'attente en secondes.
+    """
+    limits = getattr(settings, 'RATE_LIMITS', {}).get(scope, {})
+    buckets = []
+    if 'user' in limits and user is not None and user.is_authenticated:
+        buckets.append((f'ratelimit:{scope}:user:{user.pk}', *parse_rate(limits['user'])))
+    if 'ip' in limits:
+        buckets.append((f'ratelimit:{scope}:ip:{client_ip(request)}', *parse_rate(limits['ip'])))
+    if not buckets:
+        return None
+    buckets = [(key, capacity, period * 1000) for key, capacity, period in buckets]
+
+    try:
+        result = _redis_consume(buckets)
+    except Exception as e:
+        # Redis indisponible : on laisse passer plutôt que de bloquer tout le site
+        logger.warning(f"Limitation de débit désactivée ({scope}) : {e}")
+        return None
+    allowed, wait = result if result is not None else cache_buckets.consume(buckets)
+    return None if allowed else wait / 1000
+
+
+class RateLimitThrottle(BaseThrottle):
+    """
+    Throttle DRF adossé à check_rate_limit. La vue déclare `rate_limit_scope` ;
+    les permissions ont déjà été vérifiées, donc request.user est connu.
+    """
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'rate_limit_scope', None)
+        self._wait = check_rate_limit(request, scope, request.user) if scope else None
+        return self._wait is None
+
+    def wait(self):
+        return self._wait
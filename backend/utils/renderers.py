@@ -0,0 +1,104 @@
+# utils/renderers.py
+# Rendu JSON rapide : orjson s'il est installé (pip install orjson), sinon le module json
+# de la bibliothèque standard avec l'encodeur de DRF. Rendu en flux des grandes collections :
+# le queryset est lu par blocs avec .iterator() et chaque bloc est sérialisé puis envoyé,
+# la mémoire par requête reste donc bornée par la taille d'un bloc.
+import json
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+STREAM_CHUNK_SIZE = 500
+
+_encoder = JSONEncoder()
+
+
+def dumps(data, use_orjson=True):
+    """
+    Sérialise `data` en JSON compact (bytes, UTF-8). Mêmes types acceptés que le rendu de DRF,
+    et comme lui U+2028 / U+2029 échappés (JSON valide mais JavaScript invalide avant ES2019,
+    dans un <script> par exemple).
+    NaN et ±Infinity : le rendu de DRF (STRICT_JSON) lève ValueError, comme le repli stdlib ;
+    orjson n'a pas de mode strict et les écrit `null`. Aucun champ des modèles n'est flottant.
+    """
+    if orjson is not None and use_orjson:
+        # Types natifs en C ; le reste (Decimal, chaînes paresseuses, querysets...) passe par l'encodeur de DRF
+        content = orjson.dumps(data, default=_encoder.default, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        content = json.dumps(
+            data, cls=JSONEncoder, ensure_ascii=False, allow_nan=False, separators=(',', ':'),
+        ).encode()
+    # Préfixe UTF-8 de U+2000..U+203F : sans ces caractères, le corps n'est pas recopié
+    if b'\xe2\x80' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer de DRF avec orjson. L'indentation (API navigable, ?indent) garde le rendu standard."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class StreamingJSONRenderer:
+    """
+    Rend une liste JSON sans la construire en mémoire : `stream()` lit le queryset par blocs
+    de `chunk_size` (curseur serveur sous PostgreSQL, prefetch_related appliqué à chaque bloc)
+    et produit les octets bloc par bloc. `prefix` / `suffix` entourent la liste, par exemple
+    pour l'insérer dans un objet.
+    """
+
+    def __init__(self, chunk_size=STREAM_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    def chunks(self, queryset):
+        chunk = []
+        for obj in queryset.iterator(chunk_size=self.chunk_size):
+            chunk.append(obj)
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def stream(self, queryset, serializer_class, context=None, prefix=b'[', suffix=b']'):
+        yield prefix
+        separator = b''
+        for chunk in self.chunks(queryset):
+            items = serializer_class(chunk, many=True, context=context or {}).data
+            # Une liste JSON privée de ses crochets : les éléments du bloc, séparés par des virgules
+            yield separator + dumps(items)[1:-1]
+            separator = b','
+        yield suffix
+
+    def response(self, *args, **kwargs):
+        return StreamingHttpResponse(self.stream(*args, **kwargs), content_type='application/json')
+
+    async def astream(self, *args, **kwargs):
+        """
+        Variante async de stream() pour les vues ASGI : chaque bloc est lu et sérialisé dans le
+        thread synchrone de la requête (sync_to_async). Un itérateur synchrone servi sous ASGI
+        serait d'abord lu en entier par Django, ce qui annulerait le flux.
+        """
+        chunks = self.stream(*args, **kwargs)
+        next_chunk = sync_to_async(next)
+        try:
+            while (chunk := await next_chunk(chunks, None)) is not None:
+                yield chunk
+        finally:
+            # Client déconnecté : ferme le curseur serveur dans le thread qui l'a ouvert
+            await sync_to_async(chunks.close)()
+
+    def aresponse(self, *args, **kwargs):
+        return StreamingHttpResponse(self.astream(*args, **kwargs), content_type='application/json')
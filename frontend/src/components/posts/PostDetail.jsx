@@ -12,22 +12,54 @@ const PostDetail = () => {
   const [error, setError] = useState(null);
   const [comment, setComment] = useState("");
   const [submitting, setSubmitting] = useState(false);
+  const [commentsNext, setCommentsNext] = useState(null);
+  const [loadingComments, setLoadingComments] = useState(false);
 
   useEffect(() => {
     fetchPost();
-  }, [id]);
+  }, [id, currentUser?.id]);
 
   const fetchPost = async () => {
     try {
       const data = await postService.getPostById(id);
-      console.log("Post récupéré :", data);
       setPost(data);
+      setCommentsNext(data.comments_next || null);
       setError(null);
     } catch (err) {
       setError(err.error || "Erreur lors du chargement du post");
+      return;
     } finally {
       setLoading(false);
     }
+    if (currentUser) {
+      try {
+        const { counts, my_reactions } = await postService.getMyReactions(id);
+        setPost((prev) => ({ ...prev, reaction_counts: counts, my_reactions }));
+      } catch (err) {
+        console.error("Erreur lors du chargement des réactions:", err);
+      }
+    }
+  };
+
+  const loadMoreComments = async () => {
+    if (!commentsNext) return;
+    setLoadingComments(true);
+    try {
+      const { results, next } = await postService.getComments(id, commentsNext);
+      setPost((prev) => {
+        // Un commentaire ajouté depuis cette page peut déjà être affiché
+        const known = new Set((prev.comments || []).map((c) => c.id));
+        return {
+          ...prev,
+          comments: [...(prev.comments || []), ...results.filter((c) => !known.has(c.id))],
+        };
+      });
+      setCommentsNext(next);
+    } catch (err) {
+      console.error("Erreur lors du chargement des commentaires:", err);
+    } finally {
+      setLoadingComments(false);
+    }
   };
 
   const handleBackClick = () => {
@@ -35,41 +67,38 @@ const PostDetail = () => {
   };
 
   const getReactionCount = (emoji) => {
-    return post?.reactions?.filter((r) => r.emoji === emoji).length || 0;
+    return post?.reaction_counts?.[emoji] ?? 0;
+  };
+
+  const getMyReactions = () => {
+    return post?.my_reactions ?? [];
   };
 
   const hasUserReacted = (emoji) => {
-    return post?.reactions?.some(
-      (r) => r.emoji === emoji && r.user === currentUser?.id
-    );
+    return getMyReactions().includes(emoji);
   };
 
   const handleReaction = async (emoji) => {
     if (!currentUser) return;
 
-    const updatedReactions = [...(post.reactions || [])];
-    const userReactionIndex = updatedReactions.findIndex(
-      (r) => r.emoji === emoji && r.user === currentUser.id
-    );
-
-    if (userReactionIndex !== -1) {
-      updatedReactions.splice(userReactionIndex, 1);
-    } else {
-      updatedReactions.push({
-        emoji,
-        user: currentUser.id,
-        created_at: new Date().toISOString(),
-      });
-    }
+    const reacted = hasUserReacted(emoji);
+    const myReactions = getMyReactions();
 
     setPost((prev) => ({
       ...prev,
-      reactions: updatedReactions,
+      reaction_counts: {
+        ...prev.reaction_counts,
+        [emoji]: Math.max(0, getReactionCount(emoji) + (reacted ? -1 : 1)),
+      },
+      my_reactions: reacted
+        ? myReactions.filter((e) => e !== emoji)
+        : [...myReactions, emoji],
     }));
 
     try {
-      const updatedPost = await postService.toggleReaction(id, { emoji });
-      setPost(updatedPost);
+      // Réponse compacte : { counts, my_reactions }
+      const { counts, my_reactions } = await postService.toggleReaction(id, { emoji });
+      setPost((prev) => ({ ...prev, reaction_counts: counts, my_reactions }));
     } catch (err) {
       console.error("Erreur lors de la réaction:", err);
       fetchPost();
@@ -90,6 +119,7 @@ const PostDetail = () => {
       setPost((prevPost) => ({
         ...prevPost,
         comments: [...(prevPost.comments || []), newComment],
+        comment_count: (prevPost.comment_count ?? 0) + 1,
       }));
 
       setComment("");
@@ -241,7 +271,7 @@ const PostDetail = () => {
 
           <div className="border-t border-gray-200 dark:border-gray-700 pt-6">
             <h2 className="text-xl font-semibold text-gray-900 dark:text-white mb-4">
-              Commentaires ({post.comments?.length || 0})
+              Commentaires ({post.comment_count ?? post.comments?.length ?? 0})
             </h2>
 
             {currentUser && (
@@ -286,6 +316,18 @@ const PostDetail = () => {
                 </div>
               ))}
             </div>
+
+            {commentsNext && (
+              <div className="mt-4 flex justify-center">
+                <button
+                  onClick={loadMoreComments}
+                  disabled={loadingComments}
+                  className="px-4 py-2 text-sm font-medium text-gray-700 bg-gray-100 rounded-md hover:bg-gray-200 dark:bg-gray-700 dark:text-gray-200 dark:hover:bg-gray-600 disabled:opacity-50 transition-colors"
+                >
+                  {loadingComments ? "Chargement..." : "Charger plus de commentaires"}
+                </button>
+              </div>
+            )}
           </div>
         </div>
       </article>
@@ -8,6 +8,8 @@ const PostList = () => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [expandedPost, setExpandedPost] = useState(null);
+  const [next, setNext] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const { currentUser } = useAuth();
 
   useEffect(() => {
@@ -16,8 +18,9 @@ const PostList = () => {
 
   const fetchPosts = async () => {
     try {
-      const data = await postService.getAllPosts();
-      setPosts(data);
+      const { results, next } = await postService.getAllPosts();
+      setPosts(results);
+      setNext(next);
     } catch (err) {
       setError(err.error || 'Erreur lors du chargement des posts');
     } finally {
@@ -25,11 +28,31 @@ const PostList = () => {
     }
   };
 
+  // Page suivante (pagination par curseur) : les posts déjà affichés ne sont pas ajoutés deux fois
+  const loadMorePosts = async () => {
+    if (!next || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await postService.getAllPosts(next);
+      setPosts(current => {
+        const known = new Set(current.map(post => post.id));
+        return [...current, ...page.results.filter(post => !known.has(post.id))];
+      });
+      setNext(page.next);
+    } catch (err) {
+      setError(err.error || 'Erreur lors du chargement des posts');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleReaction = async (postId, emoji) => {
     if (!currentUser) return;
     try {
-      const updatedPost = await postService.toggleReaction(postId, emoji);
-      setPosts(posts.map(post => post.id === postId ? updatedPost : post));
+      const { counts, my_reactions } = await postService.toggleReaction(postId, { emoji });
+      setPosts(current => current.map(post => post.id === postId
+        ? { ...post, reaction_counts: counts, my_reactions }
+        : post));
     } catch (err) {
       console.error('Erreur lors de la réaction:', err);
     }
@@ -115,7 +138,7 @@ const PostList = () => {
             <div className="mt-4 flex items-center space-x-4">
               <div className="flex items-center space-x-2">
                 <button
-                  onClick={() => handleReaction(post.id, '👍')}
+                  onClick={() => handleReaction(post.id, 'LIKE')}
                   disabled={!currentUser}
                   className={`p-2 rounded-full hover:bg-gray-100 dark:hover:bg-gray-700 ${
                     !currentUser ? 'opacity-50 cursor-not-allowed' : ''
@@ -124,12 +147,12 @@ const PostList = () => {
                   👍
                 </button>
                 <span className="text-sm text-gray-600 dark:text-gray-400">
-                  {post.reactions?.find(r => r.emoji === '👍')?.count || 0}
+                  {post.reaction_counts?.LIKE || 0}
                 </span>
               </div>
               <div className="flex items-center space-x-2">
                 <button
-                  onClick={() => handleReaction(post.id, '❤️')}
+                  onClick={() => handleReaction(post.id, 'LOVE')}
                   disabled={!currentUser}
                   className={`p-2 rounded-full hover:bg-gray-100 dark:hover:bg-gray-700 ${
                     !currentUser ? 'opacity-50 cursor-not-allowed' : ''
@@ -138,12 +161,12 @@ const PostList = () => {
                   ❤️
                 </button>
                 <span className="text-sm text-gray-600 dark:text-gray-400">
-                  {post.reactions?.find(r => r.emoji === '❤️')?.count || 0}
+                  {post.reaction_counts?.LOVE || 0}
                 </span>
               </div>
               <div className="flex items-center space-x-2">
                 <button
-                  onClick={() => handleReaction(post.id, '😂')}
+                  onClick={() => handleReaction(post.id, 'HAHA')}
                   disabled={!currentUser}
                   className={`p-2 rounded-full hover:bg-gray-100 dark:hover:bg-gray-700 ${
                     !currentUser ? 'opacity-50 cursor-not-allowed' : ''
@@ -152,7 +175,7 @@ const PostList = () => {
                   😂
                 </button>
                 <span className="text-sm text-gray-600 dark:text-gray-400">
-                  {post.reactions?.find(r => r.emoji === '😂')?.count || 0}
+                  {post.reaction_counts?.HAHA || 0}
                 </span>
               </div>
             </div>
@@ -162,12 +185,24 @@ const PostList = () => {
                 to={`/posts/${post.id}`}
                 className="text-blue-600 hover:text-blue-800 dark:text-blue-400 dark:hover:text-blue-300 text-sm font-medium"
               >
-                Voir les commentaires ({post.comments?.length || 0})
+                Voir les commentaires ({post.comment_count || 0})
               </Link>
             </div>
           </div>
         </article>
       ))}
+
+      {next && (
+        <div className="flex justify-center">
+          <button
+            onClick={loadMorePosts}
+            disabled={loadingMore}
+            className="px-4 py-2 text-sm font-medium text-blue-600 hover:text-blue-800 dark:text-blue-400 dark:hover:text-blue-300 disabled:opacity-50"
+          >
+            {loadingMore ? 'Chargement...' : 'Charger plus de posts'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
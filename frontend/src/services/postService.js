@@ -3,10 +3,14 @@ import axiosInstance from "../utils/axiosConfig";
 const API_URL = "";
 
 const postService = {
-  getAllPosts: async () => {
+  // Une page de posts ({ results, next }) : `nextUrl` est le lien `next` de la page précédente
+  getAllPosts: async (nextUrl) => {
     try {
-      const response = await axiosInstance.get(`${API_URL}/posts/`);
-      return response.data;
+      const cursor = nextUrl ? new URL(nextUrl).searchParams.get("cursor") : null;
+      const response = await axiosInstance.get(`${API_URL}/posts/`, {
+        params: cursor ? { cursor } : {},
+      });
+      return { results: response.data.results, next: response.data.next };
     } catch (error) {
       throw error.response
         ? error.response.data
@@ -25,6 +29,33 @@ const postService = {
     }
   },
 
+  // Page suivante des commentaires : `nextUrl` est le lien `comments_next` / `next` de l'API
+  getComments: async (postId, nextUrl) => {
+    try {
+      const cursor = nextUrl ? new URL(nextUrl).searchParams.get("cursor") : null;
+      const response = await axiosInstance.get(`${API_URL}/posts/${postId}/comments/`, {
+        params: cursor ? { cursor } : {},
+      });
+      return response.data;
+    } catch (error) {
+      throw error.response
+        ? error.response.data
+        : { error: "Erreur de connexion au serveur" };
+    }
+  },
+
+  // Compteurs et réactions de l'utilisateur connecté (le détail public n'en contient pas)
+  getMyReactions: async (postId) => {
+    try {
+      const response = await axiosInstance.get(`${API_URL}/posts/${postId}/reactions/mine/`);
+      return response.data;
+    } catch (error) {
+      throw error.response
+        ? error.response.data
+        : { error: "Erreur de connexion au serveur" };
+    }
+  },
+
   createPost: async (postData) => {
     try {
       const response = await axiosInstance.post(